@@ -0,0 +1,206 @@
+"""
+模糊搜索性能基准
+功能：在合成语料上对比有/无 pg_trgm 三元组索引时 ILIKE 子串搜索（分页查询与计数）的耗时
+
+基准使用单独的数据库（默认 news_db_benchmark），不会修改正式数据。首次运行时生成合成文章并写入，
+之后再次运行会复用已有数据。"无索引"的结果在一个事务内临时删除三元组索引后测得，结束时回滚。
+
+用法:
+  python scripts/benchmark_search.py                      # 100 万篇文章
+  python scripts/benchmark_search.py --articles 200000 --repeat 3
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+TRGM_INDEXES = ["idx_articles_title_trgm", "idx_articles_content_trgm", "idx_articles_source_trgm"]
+
+SOURCES = [f"source{i:02d}.example.com" for i in range(20)] + ["Reuters", "BBC News", "新华网", "澎湃新闻"]
+
+# 生成词表的音节
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "qu", "ab", "or", "en", "it", "ul", "ph", "st", "tr"]
+
+
+def _make_vocabulary(rng: random.Random, size: int = 20000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return sorted(words)
+
+
+def generate_articles(count: int, seed: int = 42):
+    """按 Zipf 式分布从词表取词，生成合成文章"""
+    rng = random.Random(seed)
+    vocab = _make_vocabulary(rng)
+    # 越靠前的词越常见
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocab))))
+    start = date(2020, 1, 1)
+    for i in range(count):
+        title_words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(5, 12))
+        content_words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(80, 200))
+        yield {
+            "title": " ".join(title_words).capitalize(),
+            "content": " ".join(content_words),
+            "url": f"https://bench.example.com/article/{i}",
+            "source": rng.choice(SOURCES),
+            "published_date": None if i % 50 == 0 else start + timedelta(days=rng.randint(0, 2000)),
+        }
+
+
+def load_corpus(storage, count: int, chunk_size: int):
+    # 上限取目标数量：不足时为精确值
+    existing = storage.count_articles(cap=count)['count']
+    if existing >= count:
+        print(f"复用已有的 {existing} 篇文章")
+        return
+
+    print(f"生成并写入 {count} 篇合成文章...")
+    started = time.perf_counter()
+    batch = []
+    written = 0
+    for article in generate_articles(count):
+        batch.append(article)
+        if len(batch) >= chunk_size:
+            storage.bulk_upsert_articles(batch, chunk_size=chunk_size)
+            written += len(batch)
+            batch = []
+            print(f"  {written}/{count}", end="\r", flush=True)
+    if batch:
+        storage.bulk_upsert_articles(batch, chunk_size=chunk_size)
+    print(f"\n写入完成，用时 {time.perf_counter() - started:.1f}s")
+
+
+def _time_query(cursor, sql: str, params, repeat: int) -> float:
+    """返回多次执行的中位耗时（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_queries(cursor, queries, repeat: int):
+    from atss.db_utils import _query_condition
+
+    results = {}
+    for query_text in queries:
+        conditions, params = _query_condition(query_text)
+        where = f"WHERE {conditions[0]}"
+        page_sql = f"""
+            SELECT id, title, source, published_date
+            FROM articles {where}
+            ORDER BY articles.published_date DESC NULLS LAST, id DESC
+            LIMIT 25
+        """
+        count_sql = f"SELECT COUNT(*) FROM articles {where}"
+        results[query_text] = (
+            _time_query(cursor, page_sql, params, repeat),
+            _time_query(cursor, count_sql, params, repeat),
+        )
+    return results
+
+
+def pick_queries(storage, sample: int = 5000):
+    """按语料中的实际词频挑选常见词和罕见词，另加来源名和短于 3 个字符的查询
+
+    词频为前 sample 篇文章中标题或正文含有该词的文章数，只考虑至少 3 个字符（能使用三元组索引）的词：
+    常见词为出现在最多文章中的词，罕见词为出现在最少文章中的词（按字母序取第一个）。
+
+    Returns:
+        (查询列表, {词: 样本中含有该词的文章数})
+    """
+    rows = storage._fetch_dicts("SELECT title, content FROM articles ORDER BY id LIMIT %s", (sample,))
+    counts = Counter(
+        word
+        for row in rows
+        for word in set(f"{row['title']} {row['content'] or ''}".lower().split())
+        if len(word) >= 3
+    )
+    if not counts:
+        return ["kalomine", "kalo", "reuters", "新华", "ka"], {}
+    common = counts.most_common(1)[0][0]
+    rarest = min(counts.values())
+    rare = min(word for word, count in counts.items() if count == rarest)
+    return [rare, common, "reuters", "新华", "ka"], {rare: counts[rare], common: counts[common]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比有/无 pg_trgm 索引时 ILIKE 子串搜索的耗时")
+    parser.add_argument("--database", default="news_db_benchmark", help="基准使用的数据库名")
+    parser.add_argument("--articles", type=int, default=1_000_000, help="合成文章数量")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="每批写入的文章数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个查询执行的次数（取中位数）")
+    args = parser.parse_args()
+
+    # 必须在导入 db_utils 之前设置，连接池按环境变量连接数据库
+    os.environ["DB_NAME"] = args.database
+    # 写入语料前后都要计数，不缓存计数结果
+    os.environ["DB_COUNT_CACHE_TTL"] = "0"
+    from atss.db_utils import ArticleStorage, NewsDatabase
+
+    storage = ArticleStorage()
+    load_corpus(storage, args.articles, args.chunk_size)
+
+    # 批量写入的 GIN 索引条目先进入待处理列表，列表很长时规划器在大多数分区上放弃三元组索引；
+    # VACUUM 合并待处理列表并更新统计信息，得到自动清理追上写入之后的稳定状态
+    maintenance = NewsDatabase.connect_unpooled()
+    try:
+        maintenance.autocommit = True
+        with maintenance.cursor() as cursor:
+            cursor.execute("VACUUM (ANALYZE) articles")
+    finally:
+        maintenance.close()
+
+    with NewsDatabase.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'articles' AND indexname = ANY(%s)",
+                           (TRGM_INDEXES,))
+            present = [row[0] for row in cursor.fetchall()]
+
+    queries, frequencies = pick_queries(storage)
+    total = storage.count_articles(cap=args.articles)['count']
+    print(f"\n语料: {total} 篇文章, 查询: {queries}, 每个查询执行 {args.repeat} 次")
+    print(f"样本中含有该词的文章数（罕见词、常见词）: {frequencies}\n")
+
+    with NewsDatabase.connection() as conn:
+        with conn.cursor() as cursor:
+            # 在事务内删除索引测得"无索引"耗时，随后回滚恢复
+            for index in present:
+                cursor.execute(f"DROP INDEX {index}")
+            before = run_queries(cursor, queries, args.repeat)
+            conn.rollback()
+
+    after = None
+    if present:
+        with NewsDatabase.connection() as conn:
+            with conn.cursor() as cursor:
+                after = run_queries(cursor, queries, args.repeat)
+    else:
+        print("⚠ 未找到 pg_trgm 索引（服务器未安装 pg_trgm 扩展？），只报告无索引的耗时\n")
+
+    header = f"{'查询':<20}{'分页(无索引)':>14}{'分页(索引)':>14}{'计数(无索引)':>14}{'计数(索引)':>14}"
+    print(header)
+    print("-" * len(header))
+    for query_text in queries:
+        page_before, count_before = before[query_text]
+        if after:
+            page_after, count_after = after[query_text]
+            print(f"{query_text:<20}{page_before:>12.1f}ms{page_after:>12.1f}ms{count_before:>12.1f}ms{count_after:>12.1f}ms")
+        else:
+            print(f"{query_text:<20}{page_before:>12.1f}ms{'-':>14}{count_before:>12.1f}ms{'-':>14}")
+
+
+if __name__ == "__main__":
+    main()
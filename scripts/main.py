@@ -148,7 +148,8 @@ class Pipeline:
 
             def acuire_news_from_rss():
                 from atss.search_engine.fts import FTSSearchEngine
-                from atss.db_utils import ArticleStorage
+                from atss.db_utils import get_article_storage
+                from atss.ingest_buffer import WriteBehindBuffer
 
                 # load opml file
                 opml_config = self.config["datasource"]["rss"]["opml"]
@@ -167,13 +168,13 @@ class Pipeline:
 
                 news_source = MetaNewsSource(news_sources)
 
-                storage = ArticleStorage(reset=False)
-                # storage the news from RSS
-                storage.save_articles(
-                    list(
-                        map(lambda news: news_to_article(news), news_source.get_news())
-                    )
-                )
+                storage = get_article_storage(reset=False)
+                # storage the news from RSS; get_news() fetches the feeds lazily,
+                # so the buffer writes earlier feeds while later ones are fetched
+                with WriteBehindBuffer(storage) as buffer:
+                    for news in news_source.get_news():
+                        buffer.put(news_to_article(news))
+                logger.info(f"RSS ingestion stats: {buffer.get_stats()}")
 
                 # search the news by topic
                 search_engine = FTSSearchEngine()
@@ -189,7 +190,7 @@ class Pipeline:
                 # search the news using web search
 
                 search_engines = {
-                    name: WebScraperSearchEngine(cfg["sitemap"], limit=10)
+                    name: WebScraperSearchEngine(cfg["sitemap"], limit=cfg.get("max_results", 10))
                     for name, cfg in webscraper_config.items()
                     if cfg["enabled"]
                 }
@@ -243,8 +244,17 @@ class Pipeline:
             with open("data/raw_articles.json", "r", encoding="utf-8") as f:
                 raw_articles = json.load(f)
 
+            # 已入库且清洗版本为当前值的文章直接使用入库时保存的清洗结果
+            precleaned = {}
+            try:
+                from atss.db_utils import get_article_storage
+
+                precleaned = get_article_storage().get_precleaned(raw_articles)
+            except Exception as e:
+                logger.warning(f"读取入库时的清洗结果失败，将重新清洗全部文章: {e}")
+
             cleaner = DataCleaner()
-            cleaned_articles = cleaner.clean_dataset(raw_articles)
+            cleaned_articles = cleaner.clean_dataset(raw_articles, precleaned=precleaned)
             cleaner.save_cleaned_data(cleaned_articles)
 
             logger.info(f"✓ 步骤2完成: 清洗了 {len(cleaned_articles)} 篇文章")
@@ -7,6 +7,7 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 from typing import List, Dict
 import logging
@@ -45,16 +46,24 @@ class TopicScraper:
             'User-Agent': self.scraper_config['user_agent']
         }
         
+        # 搜索结果缓存（按 引擎/查询/页码 缓存，过期后先返回旧结果再后台刷新）
+        from atss.search_engine.cache import get_search_cache
+        self.search_cache = get_search_cache(self.config.get('search_cache', {}))
+        
         # 初始化数据库（如果可用）
         self.use_database = True
         try:
-            from atss.db_utils import ArticleStorage
-            self.db_manager = ArticleStorage()
+            from atss.db_utils import get_article_storage
+            from atss.ingest_buffer import WriteBehindBuffer
+            self.db_manager = get_article_storage()
+            # 文章经写入缓冲攒批写库，与 MyNewsScraper 共用同一套写入路径
+            self.ingest_buffer = WriteBehindBuffer(self.db_manager)
             logger.info("数据库管理器初始化成功")
         except Exception as e:
             logger.warning(f"数据库初始化失败，将只保存到文件: {e}")
             self.use_database = False
             self.db_manager = None
+            self.ingest_buffer = None
         
         # 初始化智能源查找器（根据配置决定是否启用）
         topic_search_config = self.config.get('topic_search', {})
@@ -78,53 +87,9 @@ class TopicScraper:
         搜索百度新闻
         """
         articles = []
-        search_url = f"https://www.baidu.com/s?tn=news&rtt=1&bsst=1&cl=2&wd={quote(self.topic)}"
         
         try:
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 查找新闻条目
-            news_items = soup.find_all('div', class_='result', limit=max_results)
-            
-            for item in news_items:
-                try:
-                    # 提取标题和链接
-                    title_tag = item.find('h3') or item.find('a')
-                    if title_tag:
-                        link_tag = title_tag if title_tag.name == 'a' else title_tag.find('a')
-                        if link_tag:
-                            title = link_tag.get_text(strip=True)
-                            url = link_tag.get('href', '')
-                            
-                            # 提取来源
-                            source_tag = item.find('span', class_='c-color-gray')
-                            source = source_tag.get_text(strip=True) if source_tag else '百度新闻'
-                            
-                            # 提取时间
-                            time_tag = item.find('time')
-                            published_date = datetime.now().strftime("%Y-%m-%d")
-                            if time_tag and time_tag.get('datetime'):
-                                try:
-                                    published_date = time_tag.get('datetime').split('T')[0]
-                                except:
-                                    pass
-                            
-                            articles.append({
-                                'title': title,
-                                'url': url,
-                                'source': source,
-                                'published_date': published_date,
-                                'content': '',  # 需要进一步爬取
-                                'topic': self.topic,
-                                'scraped_at': datetime.now().isoformat()
-                            })
-                except Exception as e:
-                    logger.warning(f"解析新闻项失败: {e}")
-                    continue
-            
+            articles = self.search_cache.get_or_fetch('baidu_news', self.topic, 1, self._fetch_baidu_news)[:max_results]
             logger.info(f"从百度新闻搜索到 {len(articles)} 篇关于 '{self.topic}' 的文章")
             
         except Exception as e:
@@ -132,161 +97,267 @@ class TopicScraper:
         
         return articles
     
-    def search_bing_news(self, max_results: int = 100) -> List[Dict]:
-        """使用Bing新闻搜索（RSS + 网页版分页）"""
+    def _fetch_baidu_news(self) -> List[Dict]:
+        """请求并解析百度新闻搜索结果页"""
         articles = []
-        seen_urls = set()
+        search_url = f"https://www.baidu.com/s?tn=news&rtt=1&bsst=1&cl=2&wd={quote(self.topic)}"
         
-        # 先尝试RSS获取最新的
-        search_url = f"https://www.bing.com/news/search?q={quote(self.topic)}&format=rss"
+        response = requests.get(search_url, headers=self.headers, timeout=10)
+        response.raise_for_status()
         
-        try:
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')
-            
-            for item in items:
-                try:
-                    title = item.find('title').get_text(strip=True) if item.find('title') else ''
-                    url = item.find('link').get_text(strip=True) if item.find('link') else ''
-                    description = item.find('description').get_text(strip=True) if item.find('description') else ''
-                    
-                    pub_date = item.find('pubDate')
-                    published_date = datetime.now().strftime("%Y-%m-%d")
-                    if pub_date:
-                        try:
-                            from dateutil import parser
-                            dt = parser.parse(pub_date.get_text())
-                            published_date = dt.strftime("%Y-%m-%d")
-                        except:
-                            pass
-                    
-                    # 提取来源
-                    source_tag = item.find('source')
-                    source = source_tag.get_text(strip=True) if source_tag else 'Bing News'
-                    
-                    if url not in seen_urls:
-                        seen_urls.add(url)
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # 查找新闻条目
+        news_items = soup.find_all('div', class_='result')
+        
+        for item in news_items:
+            try:
+                # 提取标题和链接
+                title_tag = item.find('h3') or item.find('a')
+                if title_tag:
+                    link_tag = title_tag if title_tag.name == 'a' else title_tag.find('a')
+                    if link_tag:
+                        title = link_tag.get_text(strip=True)
+                        url = link_tag.get('href', '')
+                        
+                        # 提取来源
+                        source_tag = item.find('span', class_='c-color-gray')
+                        source = source_tag.get_text(strip=True) if source_tag else '百度新闻'
+                        
+                        # 提取时间
+                        time_tag = item.find('time')
+                        published_date = datetime.now().strftime("%Y-%m-%d")
+                        if time_tag and time_tag.get('datetime'):
+                            try:
+                                published_date = time_tag.get('datetime').split('T')[0]
+                            except:
+                                pass
+                        
                         articles.append({
                             'title': title,
                             'url': url,
                             'source': source,
                             'published_date': published_date,
-                            'content': description,
+                            'content': '',  # 需要进一步爬取
                             'topic': self.topic,
                             'scraped_at': datetime.now().isoformat()
                         })
-                except Exception as e:
-                    logger.warning(f"解析Bing新闻项失败: {e}")
-                    continue
+            except Exception as e:
+                logger.warning(f"解析新闻项失败: {e}")
+                continue
+        
+        return articles
+    
+    def search_bing_news(self, max_results: int = 100) -> List[Dict]:
+        """使用Bing新闻搜索（RSS + 网页版分页）"""
+        articles = []
+        seen_urls = set()
+        
+        # 先尝试RSS获取最新的
+        try:
+            for article in self.search_cache.get_or_fetch('bing_news_rss', self.topic, 1, self._fetch_bing_rss):
+                if article['url'] not in seen_urls:
+                    seen_urls.add(article['url'])
+                    articles.append(article)
             
             logger.info(f"从Bing News RSS获取 {len(articles)} 篇文章")
             
         except Exception as e:
             logger.error(f"搜索Bing News RSS失败: {e}")
         
-        # 如果需要更多结果，使用网页版分页搜索
+        # 如果需要更多结果，使用网页版分页搜索（并发请求，按到达顺序去重）
         if len(articles) < max_results:
             logger.info(f"RSS结果不足，尝试网页版获取更多（目标: {max_results}篇）")
-            page = 1
             max_pages = min(10, (max_results // 10) + 1)  # 每页约10条结果
+            concurrency = self.config.get('topic_search', {}).get('bing_page_concurrency', 3)
             
-            while len(articles) < max_results and page <= max_pages:
-                try:
-                    # Bing新闻网页版URL，first参数控制分页
-                    first_param = (page - 1) * 10 + 1
-                    web_url = f"https://www.bing.com/news/search?q={quote(self.topic)}&first={first_param}"
-                    
-                    response = requests.get(web_url, headers=self.headers, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # 查找新闻卡片
-                    news_cards = soup.find_all('div', class_='news-card')
-                    if not news_cards:
-                        # 尝试其他可能的选择器
-                        news_cards = soup.find_all('article')
-                    
-                    if not news_cards:
-                        logger.warning(f"第{page}页未找到新闻卡片，停止分页")
-                        break
-                    
-                    page_articles = 0
-                    for card in news_cards:
+            executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+            pending = {}
+            next_page = 1
+            stop_page = max_pages + 1  # 遇到空页后，不再接受该页之后的结果
+            try:
+                while next_page <= max_pages and len(pending) < concurrency:
+                    pending[executor.submit(self._fetch_bing_web_page_cached, next_page)] = next_page
+                    next_page += 1
+                
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page = pending.pop(future)
+                        if page >= stop_page or len(articles) >= max_results:
+                            continue
+                        
                         try:
-                            # 提取标题和链接
-                            title_tag = card.find('a', class_='title')
-                            if not title_tag:
-                                title_tag = card.find('a')
-                            
-                            if not title_tag:
-                                continue
-                            
-                            title = title_tag.get_text(strip=True)
-                            url = title_tag.get('href', '')
-                            
+                            page_items = future.result()
+                        except Exception as e:
+                            logger.error(f"搜索Bing News网页版第{page}页失败: {e}")
+                            stop_page = min(stop_page, page)
+                            continue
+                        
+                        page_articles = 0
+                        for item in page_items:
                             # 跳过已存在的URL
-                            if url in seen_urls or not url:
+                            if item['url'] in seen_urls:
                                 continue
-                            
-                            # 提取描述
-                            desc_tag = card.find('div', class_='snippet') or card.find('p')
-                            description = desc_tag.get_text(strip=True) if desc_tag else ''
-                            
-                            # 提取来源
-                            source_tag = card.find('span', class_='source')
-                            source = source_tag.get_text(strip=True) if source_tag else 'Bing News'
-                            
-                            # 提取日期
-                            date_tag = card.find('span', class_='time')
-                            published_date = datetime.now().strftime("%Y-%m-%d")
-                            if date_tag:
-                                date_text = date_tag.get_text(strip=True)
-                                # 简单处理日期（今天、昨天等）
-                                if '小时' in date_text or '分钟' in date_text or '刚刚' in date_text:
-                                    published_date = datetime.now().strftime("%Y-%m-%d")
-                                elif '昨天' in date_text:
-                                    published_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                            
-                            seen_urls.add(url)
-                            articles.append({
-                                'title': title,
-                                'url': url,
-                                'source': source,
-                                'published_date': published_date,
-                                'content': description,
-                                'topic': self.topic,
-                                'scraped_at': datetime.now().isoformat()
-                            })
+                            seen_urls.add(item['url'])
+                            articles.append(item)
                             page_articles += 1
-                            
                             if len(articles) >= max_results:
                                 break
                         
-                        except Exception as e:
-                            logger.warning(f"解析网页新闻卡片失败: {e}")
-                            continue
-                    
-                    logger.info(f"第{page}页获取 {page_articles} 篇文章，累计 {len(articles)} 篇")
+                        logger.info(f"第{page}页获取 {page_articles} 篇文章，累计 {len(articles)} 篇")
+                        
+                        if page_articles == 0:
+                            logger.warning(f"第{page}页无新文章，停止分页")
+                            stop_page = min(stop_page, page)
                     
-                    if page_articles == 0:
-                        logger.warning(f"第{page}页无新文章，停止分页")
-                        break
+                    if len(articles) >= max_results or next_page >= stop_page:
+                        # 已满足数量或分页已到尽头：取消尚未开始的请求，只等待更早页的结果
+                        for future, page in list(pending.items()):
+                            if len(articles) >= max_results or page > stop_page:
+                                future.cancel()
+                                del pending[future]
+                        continue
                     
-                    page += 1
-                    time.sleep(1)  # 避免请求过快
-                
-                except Exception as e:
-                    logger.error(f"搜索Bing News网页版第{page}页失败: {e}")
-                    break
+                    while next_page <= max_pages and len(pending) < concurrency:
+                        pending[executor.submit(self._fetch_bing_web_page_cached, next_page)] = next_page
+                        next_page += 1
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
             
             logger.info(f"从Bing News共获取 {len(articles)} 篇关于 '{self.topic}' 的文章")
         
         return articles[:max_results]
     
+    def _fetch_bing_rss(self) -> List[Dict]:
+        """请求并解析Bing新闻RSS（不做去重）"""
+        articles = []
+        search_url = f"https://www.bing.com/news/search?q={quote(self.topic)}&format=rss"
+        
+        response = requests.get(search_url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.content, 'xml')
+        items = soup.find_all('item')
+        
+        for item in items:
+            try:
+                title = item.find('title').get_text(strip=True) if item.find('title') else ''
+                url = item.find('link').get_text(strip=True) if item.find('link') else ''
+                description = item.find('description').get_text(strip=True) if item.find('description') else ''
+                
+                pub_date = item.find('pubDate')
+                published_date = datetime.now().strftime("%Y-%m-%d")
+                if pub_date:
+                    try:
+                        from dateutil import parser
+                        dt = parser.parse(pub_date.get_text())
+                        published_date = dt.strftime("%Y-%m-%d")
+                    except:
+                        pass
+                
+                # 提取来源
+                source_tag = item.find('source')
+                source = source_tag.get_text(strip=True) if source_tag else 'Bing News'
+                
+                articles.append({
+                    'title': title,
+                    'url': url,
+                    'source': source,
+                    'published_date': published_date,
+                    'content': description,
+                    'topic': self.topic,
+                    'scraped_at': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.warning(f"解析Bing新闻项失败: {e}")
+                continue
+        
+        return articles
+    
+    def _fetch_bing_web_page_cached(self, page: int) -> List[Dict]:
+        """带缓存的 _fetch_bing_web_page"""
+        return self.search_cache.get_or_fetch('bing_news_web', self.topic, page, lambda: self._fetch_bing_web_page(page))
+    
+    def _fetch_bing_web_page(self, page: int) -> List[Dict]:
+        """请求并解析Bing新闻网页版的一页结果（不做去重）
+        
+        Args:
+            page: 页码，从1开始；first参数按每页10条计算
+        
+        Returns:
+            该页解析出的文章列表，无新闻卡片时返回空列表
+        """
+        # Bing新闻网页版URL，first参数控制分页
+        first_param = (page - 1) * 10 + 1
+        web_url = f"https://www.bing.com/news/search?q={quote(self.topic)}&first={first_param}"
+        
+        response = requests.get(web_url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # 查找新闻卡片
+        news_cards = soup.find_all('div', class_='news-card')
+        if not news_cards:
+            # 尝试其他可能的选择器
+            news_cards = soup.find_all('article')
+        
+        if not news_cards:
+            logger.warning(f"第{page}页未找到新闻卡片")
+            return []
+        
+        page_items = []
+        for card in news_cards:
+            try:
+                # 提取标题和链接
+                title_tag = card.find('a', class_='title')
+                if not title_tag:
+                    title_tag = card.find('a')
+                
+                if not title_tag:
+                    continue
+                
+                title = title_tag.get_text(strip=True)
+                url = title_tag.get('href', '')
+                if not url:
+                    continue
+                
+                # 提取描述
+                desc_tag = card.find('div', class_='snippet') or card.find('p')
+                description = desc_tag.get_text(strip=True) if desc_tag else ''
+                
+                # 提取来源
+                source_tag = card.find('span', class_='source')
+                source = source_tag.get_text(strip=True) if source_tag else 'Bing News'
+                
+                # 提取日期
+                date_tag = card.find('span', class_='time')
+                published_date = datetime.now().strftime("%Y-%m-%d")
+                if date_tag:
+                    date_text = date_tag.get_text(strip=True)
+                    # 简单处理日期（今天、昨天等）
+                    if '小时' in date_text or '分钟' in date_text or '刚刚' in date_text:
+                        published_date = datetime.now().strftime("%Y-%m-%d")
+                    elif '昨天' in date_text:
+                        published_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+                
+                page_items.append({
+                    'title': title,
+                    'url': url,
+                    'source': source,
+                    'published_date': published_date,
+                    'content': description,
+                    'topic': self.topic,
+                    'scraped_at': datetime.now().isoformat()
+                })
+            
+            except Exception as e:
+                logger.warning(f"解析网页新闻卡片失败: {e}")
+                continue
+        
+        return page_items
+    
     def scrape_article_content(self, url: str) -> str:
         """爬取文章详细内容"""
         try:
@@ -519,15 +590,22 @@ class TopicScraper:
         return output_path
     
     def save_to_database(self):
-        """保存到数据库"""
+        """保存到数据库（提交到写入缓冲，等待全部写入后返回成功写入的文章数）"""
         if not self.use_database or not self.db_manager:
             logger.warning("数据库未启用")
             return 0
         
-        return self.db_manager.insert_articles_batch(self.articles)
+        failed_before = self.ingest_buffer.get_stats()['failed']
+        self.ingest_buffer.put_many(self.articles)
+        self.ingest_buffer.flush()
+        stats = self.ingest_buffer.get_stats()
+        logger.info(f"写入缓冲统计: {stats}")
+        return len(self.articles) - (stats['failed'] - failed_before)
     
     def close(self):
         """关闭资源"""
+        if self.ingest_buffer:
+            self.ingest_buffer.close()
         if self.db_manager:
             self.db_manager.close()
 
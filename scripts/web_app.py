@@ -16,7 +16,7 @@ from psycopg2.extras import RealDictCursor
 
 from typing import List, Dict
 
-from atss.db_utils import ArticleStorage
+from atss.db_utils import ArticleStorage, get_article_storage
 
 # Serve templates from project-level templates/ and static assets from project-level static/
 app = Flask(
@@ -28,6 +28,43 @@ app = Flask(
 from atss import logger
 
 
+def _fetch_page(storage: ArticleStorage, q: str, page: int, per_page: int, sort_by: str, sort_dir: str, cursor: str,
+                projection: str = 'list'):
+    """Return (articles, next_cursor, has_more) for one page.
+
+    Following next_cursor uses keyset pagination, so deep pages cost the same as the first one.
+    Jumping straight to page N without a cursor falls back to OFFSET and returns no cursor.
+    """
+    if cursor or page == 1:
+        articles, next_cursor = storage.get_articles_page(q or None, limit=per_page, sort_by=sort_by, sort_dir=sort_dir, cursor=cursor, projection=projection)
+        return articles, next_cursor, next_cursor is not None
+
+    # fetch one extra row to know whether a next page exists
+    offset = (page - 1) * per_page
+    if q:
+        articles = storage.get_articles_by_query_with_sort(q, limit=per_page + 1, offset=offset, sort_by=sort_by, sort_dir=sort_dir, projection=projection)
+    else:
+        articles = storage.get_all_articles_with_sort_and_offset(limit=per_page + 1, offset=offset, sort_by=sort_by, sort_dir=sort_dir, projection=projection)
+    return articles[:per_page], None, len(articles) > per_page
+
+
+def _pagination(page: int, per_page: int, count: dict, next_cursor, has_more: bool) -> dict:
+    """Pagination metadata; total is an estimate when total_exact is False."""
+    total = count['count']
+    total_pages = max(1, (total + per_page - 1) // per_page)
+    if has_more:
+        total_pages = max(total_pages, page + 1)
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'total_exact': count['exact'],
+        'total_pages': total_pages,
+        'has_more': has_more,
+        'next_cursor': next_cursor,
+    }
+
+
 @app.route('/')
 def index():
     return "Go to /articles to view the articles UI"
@@ -41,6 +78,7 @@ def articles_page():
     per_page = request.args.get('per_page', request.args.get('limit', 5))
     sort_by = request.args.get('sort_by', 'published_date')
     sort_dir = request.args.get('sort_dir', 'desc')
+    cursor = request.args.get('cursor') or None
     try:
         page = int(page)
     except:
@@ -57,26 +95,19 @@ def articles_page():
     if per_page < 1:
         per_page = 25
 
-    reader = ArticleStorage()
+    reader = get_article_storage()
     try:
-        offset = (page - 1) * per_page
-        if q:
-            total = reader.get_article_count_by_query(q)
-            articles = reader.get_articles_by_query_with_sort(q, limit=per_page, offset=offset, sort_by=sort_by, sort_dir=sort_dir)
-        else:
-            total = reader.get_article_count()
-            articles = reader.get_all_articles_with_sort_and_offset(limit=per_page, offset=offset, sort_by=sort_by, sort_dir=sort_dir)
+        count = reader.count_articles(q or None)
+        try:
+            articles, next_cursor, has_more = _fetch_page(reader, q, page, per_page, sort_by, sort_dir, cursor)
+        except ValueError as e:
+            # stale or mismatched cursor (e.g. the sort order changed): fall back to the page number
+            logger.warning(f"Ignoring pagination cursor: {e}")
+            articles, next_cursor, has_more = _fetch_page(reader, q, page, per_page, sort_by, sort_dir, None)
     finally:
         reader.close()
 
-    total_pages = max(1, (total + per_page - 1) // per_page)
-
-    pagination = {
-        'page': page,
-        'per_page': per_page,
-        'total': total,
-        'total_pages': total_pages,
-    }
+    pagination = _pagination(page, per_page, count, next_cursor, has_more)
 
     # pass pagination/sort state back to the template so headers can toggle
     return render_template('articles.html', articles=articles, q=q, per_page=per_page, page=page, sort_by=sort_by, sort_dir=sort_dir, pagination=pagination)
@@ -85,10 +116,16 @@ def articles_page():
 @app.route('/api/articles')
 def api_articles():
     q = request.args.get('q', '').strip()
+    # 'list' returns snippet/content_length instead of the full content; pass projection=full for the body
+    projection = request.args.get('projection', 'list')
     page = request.args.get('page', 1)
     per_page = request.args.get('per_page', request.args.get('limit', 25))
     sort_by = request.args.get('sort_by', 'published_date')
     sort_dir = request.args.get('sort_dir', 'desc')
+    cursor = request.args.get('cursor') or None
+    # facets=1 adds per-source and per-date-bucket counts for the query (facet_bucket: day/week/month/year)
+    facets = request.args.get('facets', '0') not in ('0', '', 'false')
+    facet_bucket = request.args.get('facet_bucket', 'month')
     try:
         page = int(page)
     except:
@@ -104,29 +141,24 @@ def api_articles():
     if per_page < 1:
         per_page = 25
 
-    storage = ArticleStorage()
+    storage = get_article_storage()
     try:
-        offset = (page - 1) * per_page
-        if q:
-            total = storage.get_article_count_by_query(q)
-            articles = storage.get_articles_by_query_with_sort(q, limit=per_page, offset=offset, sort_by=sort_by, sort_dir=sort_dir)
-        else:
-            total = storage.get_article_count()
-            articles = storage.get_all_articles_with_sort_and_offset(limit=per_page, offset=offset, sort_by=sort_by, sort_dir=sort_dir)
+        count = storage.count_articles(q or None)
+        try:
+            articles, next_cursor, has_more = _fetch_page(storage, q, page, per_page, sort_by, sort_dir, cursor, projection)
+            facet_counts = storage.get_facets(q or None, bucket=facet_bucket) if facets else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     finally:
         storage.close()
 
-    total_pages = max(1, (total + per_page - 1) // per_page)
-
-    return jsonify({
-        'meta': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'total_pages': total_pages,
-        },
+    response = {
+        'meta': _pagination(page, per_page, count, next_cursor, has_more),
         'data': articles,
-    })
+    }
+    if facet_counts is not None:
+        response['facets'] = facet_counts
+    return jsonify(response)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,318 @@
+"""
+异步文章存储
+功能：基于 psycopg 3 的异步连接池提供与 ArticleStorage 相同的查询（全文搜索、分页、计数、批量写入），
+供 asyncio 服务在事件循环中访问数据库而不阻塞
+
+SQL 与同步版本共用 db_utils 中的构造函数，两者返回的结果格式一致。
+
+用法:
+    async with AsyncArticleStorage() as storage:
+        articles, next_cursor = await storage.get_articles_page(query_text="AI", limit=25)
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from atss.db_utils import (
+    ArticleStorage,
+    NewsDatabase,
+    _COPY_STAGING_SQL,
+    _INSERT_NEW_ARTICLES_SQL,
+    _STAGING_TABLE_SQL,
+    _STORED_HASHES_SQL,
+    _UPDATE_ARTICLE_URLS_SQL,
+    _UPDATE_EXISTING_ARTICLES_SQL,
+    _count_queries,
+    _decode_cursor,
+    _dedupe_copy_rows,
+    _estimate_from_result,
+    _facet_queries,
+    _get_db_config,
+    _get_pool_config,
+    _normalize_sort,
+    _page_queries,
+    _page_result,
+    _partition_months,
+    _projection,
+    _search_query,
+    _with_cleaned_fields,
+    logger,
+)
+
+
+def _conninfo(db_config: Dict, pool_config: Dict) -> str:
+    options = {}
+    if pool_config["prepared_statements"] and pool_config["plan_cache_mode"] != "auto":
+        options["options"] = f"-c plan_cache_mode={pool_config['plan_cache_mode']}"
+    return make_conninfo(
+        host=db_config.get("host"),
+        dbname=db_config.get("database"),
+        user=db_config.get("user"),
+        password=db_config.get("password"),
+        port=db_config.get("port"),
+        **options,
+    )
+
+
+async def _bulk_upsert_chunk(cursor, rows: List[tuple]) -> Dict[str, int]:
+    """在当前事务中写入一块文章（URL不重复），返回新增/更新/未变化的数量"""
+    await cursor.execute(_STORED_HASHES_SQL, ([row[2] for row in rows],))
+    stored_hashes = {row["url"]: row["content_hash"] for row in await cursor.fetchall()}
+    # 清洗是 CPU 密集的同步代码，放到线程中执行，不阻塞事件循环
+    rows = await asyncio.to_thread(_with_cleaned_fields, rows, stored_hashes)
+
+    await cursor.execute(_STAGING_TABLE_SQL)
+    async with cursor.copy(_COPY_STAGING_SQL) as copy:
+        for row in rows:
+            await copy.write_row(row)
+
+    await cursor.execute(_INSERT_NEW_ARTICLES_SQL)
+    inserted = (await cursor.fetchone())["count"]
+
+    updated = 0
+    for sql in _UPDATE_EXISTING_ARTICLES_SQL:
+        await cursor.execute(sql)
+        updated += cursor.rowcount
+
+    await cursor.execute(_UPDATE_ARTICLE_URLS_SQL)
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(rows) - inserted - updated,
+    }
+
+
+class AsyncArticleStorage:
+    """异步数据库读写类
+
+    持有自己的异步连接池（参数同样来自 DB_POOL_* 环境变量），使用前需 await open()
+    或使用 async with。计数缓存与同步的 ArticleStorage 共享。
+    """
+
+    _count_config = ArticleStorage._count_config
+    _count_cache = ArticleStorage._count_cache
+    _facet_cache = ArticleStorage._facet_cache
+
+    def __init__(self):
+        pool_config = _get_pool_config()
+        self._pool = AsyncConnectionPool(
+            _conninfo(_get_db_config(), pool_config),
+            min_size=pool_config["minconn"],
+            max_size=pool_config["maxconn"],
+            max_lifetime=pool_config["max_lifetime"],
+            timeout=pool_config["timeout"],
+            check=AsyncConnectionPool.check_connection,
+            # psycopg 3 自动预备语句：与同步版本一样首次执行即 PREPARE，每个连接缓存最近的语句
+            kwargs={
+                "row_factory": dict_row,
+                "prepare_threshold": 0 if pool_config["prepared_statements"] else None,
+            },
+            open=False,
+        )
+
+    async def open(self):
+        """创建数据库并执行迁移（DB_AUTO_MIGRATE 未关闭时），然后打开连接池"""
+        if os.getenv("DB_AUTO_MIGRATE", "1") != "0":
+            # 迁移只在启动时执行一次，放到线程中以免阻塞事件循环
+            await asyncio.to_thread(NewsDatabase.prepare_database)
+        await self._pool.open(wait=True)
+        logger.info("Successfully created the async database connection pool.")
+
+    async def close(self):
+        """关闭连接池"""
+        await self._pool.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _fetch_dicts(self, sql: str, params=None) -> List[Dict]:
+        """执行查询并以字典列表返回所有行"""
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return await cursor.fetchall()
+
+    async def _fetch_scalar(self, sql: str, params=None):
+        """执行查询并返回第一行第一列"""
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                row = await cursor.fetchone()
+                return next(iter(row.values())) if row else None
+
+    def get_stats(self, top: int = 20) -> Dict:
+        """获取连接池的使用统计，参数同 ArticleStorage.get_stats；异步后端不记录语句耗时，'queries' 总是空列表"""
+        return {'pool': self._pool.get_stats(), 'queries': []}
+
+    async def save_articles(self, articles: List[Dict], chunk_size: int = 1000) -> int:
+        """批量插入文章到数据库
+
+        Returns:
+            成功写入（新增、更新或未变化）的文章数
+        """
+        stats = await self.bulk_upsert_articles(articles, chunk_size=chunk_size)
+        return stats['inserted'] + stats['updated'] + stats['unchanged']
+
+    async def bulk_upsert_articles(self, articles: List[Dict], chunk_size: int = 1000) -> Dict[str, int]:
+        """批量写入文章，语义与 ArticleStorage.bulk_upsert_articles 相同
+
+        Returns:
+            {'inserted': 新增数, 'updated': 更新数, 'unchanged': 未变化数, 'failed': 失败数}
+        """
+        rows, failed = _dedupe_copy_rows(articles)
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': failed}
+
+        try:
+            await self._ensure_partitions(row[4] for row in rows)
+        except Exception as e:
+            # 没有对应分区的文章会写入默认分区，不影响写入
+            logger.warning(f"创建分区失败: {e}")
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                async with self._pool.connection() as conn:
+                    async with conn.cursor() as cursor:
+                        chunk_stats = await _bulk_upsert_chunk(cursor, chunk)
+                for key, value in chunk_stats.items():
+                    stats[key] += value
+            except Exception as e:
+                logger.error(f"批量写入文章失败（{len(chunk)} 篇）: {e}")
+                stats['failed'] += len(chunk)
+
+        logger.info(
+            f"批量写入 {len(articles)} 篇文章: 新增 {stats['inserted']}, 更新 {stats['updated']}, "
+            f"未变化 {stats['unchanged']}, 失败 {stats['failed']}"
+        )
+        return stats
+
+    async def _ensure_partitions(self, published_dates):
+        """在写入前为这些发布日期所在的月份创建分区，每个分区在单独的短事务中创建"""
+        months = _partition_months(published_dates)
+        if not months:
+            return
+        async with self._pool.connection() as conn:
+            cursor = await conn.execute("SELECT to_regproc('ensure_articles_partition') IS NOT NULL AS ok")
+            if not (await cursor.fetchone())["ok"]:
+                return
+            await conn.commit()
+            for month in months:
+                await conn.execute("SELECT ensure_articles_partition(%s)", (month,))
+                await conn.commit()
+
+    async def search_article(self, query, limit: int = 50, date_from=None, date_to=None,
+                             projection: str = 'full') -> List[Dict]:
+        """全文搜索文章，按相关度排序，参数与 ArticleStorage.search_article 相同"""
+        _, columns = _projection(projection)
+        try:
+            results = await self._fetch_dicts(*_search_query(query, limit, date_from, date_to, columns))
+            logger.info(f"搜索到 {len(results)} 篇相关文章")
+            return results
+        except Exception as e:
+            logger.error(f"获取文章失败: {e}")
+            return []
+
+    async def get_articles_page(self, query_text: str = None, limit: int = 25, sort_by: str = 'published_date',
+                                sort_dir: str = 'desc', cursor: str = None,
+                                projection: str = 'full') -> Tuple[List[Dict], Optional[str]]:
+        """键集分页，参数与返回值同 ArticleStorage.get_articles_page
+
+        Raises:
+            ValueError: 游标无效或与排序方式不一致，或投影未知
+        """
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
+        after = _decode_cursor(cursor, sort_by, sort_dir) if cursor else None
+
+        queries = _page_queries(query_text, sort_by, sort_dir, after, columns)
+
+        want = limit + 1
+        rows = []
+        try:
+            for sql, params in queries:
+                if len(rows) >= want:
+                    break
+                rows += await self._fetch_dicts(sql, params + [want - len(rows)])
+        except Exception as e:
+            logger.error(f"分页获取文章失败: {e}")
+            return [], None
+
+        rows, next_cursor = _page_result(rows, limit, sort_by, sort_dir)
+        logger.info(f"分页获取了 {len(rows)} 篇文章 (排序: {sort_by} {sort_dir}, 游标: {'有' if cursor else '无'})")
+        return rows, next_cursor
+
+    async def count_articles(self, query_text: str = None, cap: int = None) -> Dict:
+        """统计文章数量（超过 cap 时返回估算值），参数与返回值同 ArticleStorage.count_articles"""
+        cap = self._count_config["cap"] if cap is None else cap
+        key = (query_text or '', cap)
+        cached = self._count_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        capped, estimate = _count_queries(query_text, cap)
+        try:
+            count = await self._fetch_scalar(*capped)
+            if count <= cap:
+                result = {'count': count, 'exact': True}
+            else:
+                estimated = _estimate_from_result(await self._fetch_scalar(*estimate))
+                result = {'count': max(estimated, cap + 1), 'exact': False}
+        except Exception as e:
+            logger.error(f"统计文章数量失败: {e}")
+            return {'count': 0, 'exact': False}
+
+        self._count_cache.set(key, result)
+        return dict(result)
+
+    async def get_article_count(self) -> int:
+        """获取文章总数（同 count_articles()['count']，超过 DB_COUNT_CAP 时为估算值，见 ArticleStorage.get_article_count）"""
+        return (await self.count_articles())['count']
+
+    async def get_facets(self, query_text: str = None, bucket: str = 'month', source_limit: int = 50) -> Dict:
+        """分面统计，参数与返回值同 ArticleStorage.get_facets
+
+        Raises:
+            ValueError: 日期分桶未知
+        """
+        (sources_sql, sources_params), (dates_sql, dates_params) = _facet_queries(query_text, bucket, source_limit)
+        key = (query_text or '', bucket, source_limit)
+        cached = self._facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = {
+                'bucket': bucket,
+                'sources': await self._fetch_dicts(sources_sql, sources_params),
+                'dates': await self._fetch_dicts(dates_sql, dates_params),
+            }
+        except Exception as e:
+            logger.error(f"分面统计失败: {e}")
+            return {'bucket': bucket, 'sources': [], 'dates': []}
+
+        self._facet_cache.set(key, result)
+        return result
+
+    async def get_sources(self) -> List[str]:
+        """获取所有新闻源（读取 article_stats 汇总表）"""
+        try:
+            rows = await self._fetch_dicts("""
+                SELECT source FROM article_stats
+                GROUP BY source
+                HAVING SUM(article_count) > 0
+                ORDER BY source
+            """)
+            return [row["source"] for row in rows]
+        except Exception as e:
+            logger.error(f"获取新闻源失败: {e}")
+            return []
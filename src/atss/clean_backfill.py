@@ -0,0 +1,34 @@
+"""
+清洗结果回填
+功能：为清洗版本不是当前 CLEANER_VERSION 的文章（迁移 0009 之前写入的文章，或修改清洗规则并递增
+版本号之后的全部文章）重新生成 cleaned_title / cleaned_content / is_valid
+
+新写入的文章在入库时已经清洗，只需在升级后或修改清洗规则后执行一次；可以中断后重新执行。
+
+用法:
+  python -m atss.clean_backfill                  # 回填所有需要重新清洗的文章
+  python -m atss.clean_backfill --batch-size 200
+"""
+
+import argparse
+
+from atss.data_cleaner import CLEANER_VERSION
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回填文章的清洗结果")
+    parser.add_argument("--batch-size", type=int, default=500, help="每个事务处理的文章数")
+    args = parser.parse_args()
+
+    from atss.db_utils import get_article_storage
+
+    storage = get_article_storage()
+    try:
+        updated = storage.backfill_cleaned(batch_size=args.batch_size)
+        print(f"✓ 已回填 {updated} 篇文章，清洗版本: {CLEANER_VERSION}")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 清洗规则的版本：修改清洗或验证规则时递增，数据库中旧版本的清洗结果会由回填任务（atss.clean_backfill）重新生成
+CLEANER_VERSION = 1
+
 
 class DataCleaner:
     """数据清洗类
@@ -87,25 +90,35 @@ class DataCleaner:
             logger.warning(f"日期标准化失败: {date_str}")
             return date_str
     
-    def clean_article(self, article: Dict) -> Dict:
-        """清洗单篇文章"""
+    def clean_article(self, article: Dict, precleaned: Dict = None, warn_short: bool = True) -> Dict:
+        """清洗单篇文章
+        
+        Args:
+            precleaned: 入库时保存的清洗结果（cleaned_title, cleaned_content），提供时直接使用，不再清洗标题和正文
+            warn_short: 内容过短时是否记录警告
+        """
         cleaned = article.copy()
         
-        # 清洗标题
-        if 'title' in cleaned:
-            cleaned['title'] = self.clean_html(cleaned['title'])
-            cleaned['title'] = self.remove_special_chars(cleaned['title'])
-            cleaned['title'] = cleaned['title'][:200]  # 限制长度
-        
-        # 清洗内容
-        if 'content' in cleaned:
-            cleaned['content'] = self.clean_html(cleaned['content'])
-            cleaned['content'] = self.remove_ads_and_boilerplate(cleaned['content'])
-            cleaned['content'] = self.remove_special_chars(cleaned['content'])
+        if precleaned is not None:
+            # 使用入库时保存的清洗结果
+            cleaned['title'] = precleaned['cleaned_title']
+            cleaned['content'] = precleaned['cleaned_content']
+        else:
+            # 清洗标题
+            if 'title' in cleaned:
+                cleaned['title'] = self.clean_html(cleaned['title'])
+                cleaned['title'] = self.remove_special_chars(cleaned['title'])
+                cleaned['title'] = cleaned['title'][:200]  # 限制长度
             
-            # 去除过短的内容
-            if len(cleaned['content']) < 100:
-                logger.warning(f"文章内容过短，可能质量不高: {cleaned.get('title', 'Unknown')}")
+            # 清洗内容
+            if 'content' in cleaned:
+                cleaned['content'] = self.clean_html(cleaned['content'])
+                cleaned['content'] = self.remove_ads_and_boilerplate(cleaned['content'])
+                cleaned['content'] = self.remove_special_chars(cleaned['content'])
+                
+                # 去除过短的内容
+                if warn_short and len(cleaned['content']) < 100:
+                    logger.warning(f"文章内容过短，可能质量不高: {cleaned.get('title', 'Unknown')}")
         
         # 标准化日期
         if 'published_date' in cleaned:
@@ -138,16 +151,45 @@ class DataCleaner:
         
         return True
     
-    def clean_dataset(self, articles: List[Dict]) -> List[Dict]:
-        """清洗整个数据集"""
+    def clean_for_storage(self, article: Dict) -> Dict:
+        """入库时清洗文章，返回要保存的清洗结果
+        
+        Returns:
+            {'cleaned_title', 'cleaned_content', 'is_valid': 是否通过验证, 'cleaner_version'}
+        """
+        article = {k: v for k, v in article.items() if v is not None}
+        cleaned = self.clean_article(article, warn_short=False)
+        return {
+            'cleaned_title': cleaned.get('title'),
+            'cleaned_content': cleaned.get('content'),
+            'is_valid': self.validate_article(cleaned),
+            'cleaner_version': CLEANER_VERSION,
+        }
+    
+    def clean_dataset(self, articles: List[Dict], precleaned: Dict[str, Dict] = None) -> List[Dict]:
+        """清洗整个数据集
+        
+        Args:
+            precleaned: URL -> 入库时保存的当前版本清洗结果（见 ArticleStorage.get_precleaned），
+                这些文章直接使用保存的结果和验证标志，不再重新清洗
+        """
         cleaned_articles = []
+        precleaned = precleaned or {}
+        reused = 0
         
         for idx, article in enumerate(articles):
             try:
-                cleaned = self.clean_article(article)
+                stored = precleaned.get(article.get('url'))
+                if stored is not None:
+                    reused += 1
+                    cleaned = self.clean_article(article, precleaned=stored)
+                    valid = stored['is_valid']
+                else:
+                    cleaned = self.clean_article(article)
+                    valid = self.validate_article(cleaned)
                 
                 # 验证清洗后的文章
-                if self.validate_article(cleaned):
+                if valid:
                     cleaned_articles.append(cleaned)
                 else:
                     logger.warning(f"文章 {idx} 未通过验证，已跳过")
@@ -156,6 +198,8 @@ class DataCleaner:
                 logger.error(f"清洗文章 {idx} 时出错: {e}")
                 continue
         
+        if reused:
+            logger.info(f"其中 {reused} 篇使用入库时保存的清洗结果")
         logger.info(f"清洗完成: {len(cleaned_articles)}/{len(articles)} 篇文章通过验证")
         return cleaned_articles
     
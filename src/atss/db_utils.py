@@ -4,12 +4,28 @@
 """
 
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 import os
 from dotenv import load_dotenv
+import atexit
+import base64
+import hashlib
+import io
+import json
 import logging
-from typing import List, Dict
-from datetime import datetime, timedelta
+import math
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+
+from atss.data_cleaner import CLEANER_VERSION, DataCleaner
 
 load_dotenv()
 
@@ -40,31 +56,494 @@ def _psycopg2_connect(db_config):
         port=db_config.get("port"),
     )
 
+def _get_pool_config() -> Dict:
+    """获取连接池配置"""
+    return {
+        "minconn": int(os.getenv("DB_POOL_MIN", "1")),
+        "maxconn": int(os.getenv("DB_POOL_MAX", "10")),
+        # 连接存活超过该秒数后回收重建
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        # 连接空闲超过该秒数后，取出时先执行 SELECT 1 检查
+        "health_check_interval": float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+        # 连接池耗尽时等待的最长秒数
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # 热点查询使用服务器端预备语句（经过 pgbouncer 等事务级连接池时需关闭）
+        "prepared_statements": os.getenv("DB_PREPARED_STATEMENTS", "1") != "0",
+        # 预备语句的计划缓存策略；auto 为 PostgreSQL 默认策略，其他取值只作用于连接池的会话
+        "plan_cache_mode": os.getenv("DB_PLAN_CACHE_MODE", "auto"),
+    }
+
+
+def _get_itersize() -> int:
+    """服务器端游标每次从数据库取回的行数"""
+    return int(os.getenv("DB_ITERSIZE", "2000"))
+
+
+def _get_count_config() -> Dict:
+    """获取分页计数配置"""
+    return {
+        # 不超过该数量时精确计数，超过时使用查询计划的估算值
+        "cap": int(os.getenv("DB_COUNT_CAP", "1000")),
+        # 计数结果的缓存秒数
+        "cache_ttl": float(os.getenv("DB_COUNT_CACHE_TTL", "30")),
+    }
+
+
+def _get_query_log_config() -> Dict:
+    """获取慢查询日志配置"""
+    return {
+        # 耗时超过该毫秒数的查询连同参数记录到日志，0 表示记录全部查询
+        "slow_ms": float(os.getenv("DB_SLOW_QUERY_MS", "200")),
+        # 慢查询中抽样执行 EXPLAIN (ANALYZE, BUFFERS) 的比例（0~1），0 表示关闭
+        "explain_sample_rate": float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0")),
+        # 执行计划追加写入的文件
+        "explain_path": os.getenv("DB_EXPLAIN_LOG", "data/slow_query_plans.log"),
+    }
+
+
+class _TTLCache:
+    """线程安全的简单 TTL 缓存"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _QueryLog:
+    """线程安全的查询耗时统计与慢查询日志
+
+    按语句文本（压缩空白后）分别累计调用次数、总耗时和耗时直方图；超过 slow_ms 的查询连同参数
+    记录到日志，并按 explain_sample_rate 抽样在同一连接上重新执行 EXPLAIN (ANALYZE, BUFFERS)，
+    把执行计划追加到 explain_path。只对 SELECT 抽样，EXPLAIN ANALYZE 会再执行一次查询。
+    """
+
+    # 直方图各桶的上限（毫秒），最后一桶为超过 5 秒
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf)
+
+    def __init__(self, slow_ms: float, explain_sample_rate: float, explain_path: str):
+        self.slow_ms = slow_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_path = explain_path
+        self._lock = threading.Lock()
+        self._explain_lock = threading.Lock()
+        self._statements: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _normalize(sql: str) -> str:
+        return " ".join(sql.split())
+
+    @staticmethod
+    def _format_params(params) -> str:
+        # 正文等长参数只保留开头
+        if params is None:
+            return "()"
+        return repr([p[:100] + "..." if isinstance(p, str) and len(p) > 100 else p for p in params])
+
+    def record(self, sql: str, params, seconds: float, cursor=None, prepared: bool = False):
+        """记录一次查询的耗时；传入 cursor 时慢查询可抽样执行 EXPLAIN
+
+        Args:
+            sql: 查询语句（%s 占位符）
+            params: 查询参数
+            seconds: 执行并取回结果的耗时
+            cursor: 执行该查询的游标（结果必须已取回）
+            prepared: 查询是否以预备语句执行，是则对 EXECUTE 做 EXPLAIN，得到实际使用的计划
+        """
+        statement = self._normalize(sql)
+        elapsed_ms = seconds * 1000
+        bucket = next(i for i, upper in enumerate(self.BUCKETS_MS) if elapsed_ms <= upper)
+        with self._lock:
+            entry = self._statements.get(statement)
+            if entry is None:
+                entry = self._statements[statement] = {
+                    "calls": 0,
+                    "slow_calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * len(self.BUCKETS_MS),
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["histogram"][bucket] += 1
+            slow = elapsed_ms >= self.slow_ms
+            if slow:
+                entry["slow_calls"] += 1
+
+        if not slow:
+            return
+        logger.warning(f"慢查询 {elapsed_ms:.1f} ms: {statement[:500]} 参数: {self._format_params(params)}")
+        if (cursor is not None and statement.upper().startswith("SELECT")
+                and random.random() < self.explain_sample_rate):
+            self._explain(cursor, sql, params, prepared, elapsed_ms)
+
+    def _explain(self, cursor, sql: str, params, prepared: bool, elapsed_ms: float):
+        params = list(params or [])
+        if prepared:
+            target = _statement_name(sql)
+            if params:
+                target += f" ({', '.join(['%s'] * len(params))})"
+            explain_sql = f"EXPLAIN (ANALYZE, BUFFERS) EXECUTE {target}"
+        else:
+            explain_sql = f"EXPLAIN (ANALYZE, BUFFERS) {sql}"
+        try:
+            cursor.execute(explain_sql, params)
+            plan = "\n".join(next(iter(row.values())) if isinstance(row, dict) else row[0]
+                             for row in cursor.fetchall())
+        except Exception as e:
+            # 只读查询，回滚不影响已取回的结果
+            cursor.connection.rollback()
+            logger.warning(f"获取慢查询执行计划失败: {e}")
+            return
+
+        with self._explain_lock:
+            try:
+                directory = os.path.dirname(self.explain_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.explain_path, "a", encoding="utf-8") as f:
+                    f.write(f"-- {datetime.now().isoformat(timespec='seconds')} 耗时 {elapsed_ms:.1f} ms\n"
+                            f"-- 参数: {self._format_params(params)}\n"
+                            f"{self._normalize(sql)}\n{plan}\n\n")
+            except OSError as e:
+                logger.warning(f"写入执行计划文件失败: {e}")
+
+    def _percentile(self, histogram: List[int], p: float, max_ms: float) -> float:
+        # 以所在桶的上限近似；落在最后一桶（无上限）时取最大耗时
+        target = max(1, math.ceil(sum(histogram) * p))
+        seen = 0
+        for upper, count in zip(self.BUCKETS_MS, histogram):
+            seen += count
+            if seen >= target:
+                break
+        return min(upper, round(max_ms, 2))
+
+    def get_stats(self, top: int = 20) -> List[Dict]:
+        """按总耗时倒序返回前 top 条语句的统计；百分位数取所在直方图桶的上限（毫秒，不超过最大耗时）"""
+        with self._lock:
+            entries = [(statement, dict(entry, histogram=list(entry["histogram"])))
+                       for statement, entry in self._statements.items()]
+        entries.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+
+        stats = []
+        for statement, entry in entries[:top]:
+            histogram = entry["histogram"]
+            stats.append({
+                "statement": statement[:500],
+                "calls": entry["calls"],
+                "slow_calls": entry["slow_calls"],
+                "total_ms": round(entry["total_ms"], 2),
+                "mean_ms": round(entry["total_ms"] / entry["calls"], 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "p50_ms": self._percentile(histogram, 0.5, entry["max_ms"]),
+                "p95_ms": self._percentile(histogram, 0.95, entry["max_ms"]),
+                "p99_ms": self._percentile(histogram, 0.99, entry["max_ms"]),
+                "histogram": {
+                    (f"<={upper:g}ms" if upper != math.inf else f">{self.BUCKETS_MS[-2]:g}ms"): count
+                    for upper, count in zip(self.BUCKETS_MS, histogram) if count
+                },
+            })
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+
+def _statement_name(sql: str) -> str:
+    """预备语句名：由规范化后的 SQL 文本决定"""
+    normalized = " ".join(sql.split())
+    return "atss_" + hashlib.md5(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _numbered_placeholders(sql: str) -> str:
+    """把 %s 占位符改写为 PREPARE 使用的 $1, $2, ..."""
+    counter = iter(range(1, sql.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", sql)
+
+
+class _ConnectionPool:
+    """线程安全的连接池
+
+    在 psycopg2 的 ThreadedConnectionPool 之上增加：连接耗尽时阻塞等待、
+    空闲连接的健康检查、按存活时间回收连接，以及使用统计。
+    """
+
+    def __init__(self, db_config: Dict, minconn: int, maxconn: int,
+                 max_lifetime: float, health_check_interval: float, timeout: float,
+                 prepared_statements: bool = True, plan_cache_mode: str = "auto"):
+        self.max_lifetime = max_lifetime
+        self.prepared_statements = prepared_statements
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        if prepared_statements and plan_cache_mode != "auto":
+            db_config = db_config | {"options": f"-c plan_cache_mode={plan_cache_mode}"}
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **db_config)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._meta: Dict[int, Dict] = {}
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "wait_timeouts": 0,
+            # 预备语句：首次在某个连接上执行时 PREPARE，之后直接 EXECUTE（计划缓存命中）
+            "statements_prepared": 0,
+            "prepared_executions": 0,
+        }
+
+    def _discard(self, conn):
+        with self._lock:
+            self._meta.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    def _is_healthy(self, conn) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"连接健康检查失败，将重建连接: {e}")
+            return False
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.stats["wait_timeouts"] += 1
+            raise PoolError(f"等待数据库连接超时（{self.timeout}s）")
+        try:
+            while True:
+                conn = self._pool.getconn()
+                now = time.monotonic()
+                with self._lock:
+                    meta = self._meta.setdefault(id(conn), {"created_at": now, "last_used": now})
+                if conn.closed or now - meta["created_at"] > self.max_lifetime:
+                    with self._lock:
+                        self.stats["recycled"] += 1
+                    self._discard(conn)
+                    continue
+                if now - meta["last_used"] > self.health_check_interval and not self._is_healthy(conn):
+                    with self._lock:
+                        self.stats["health_check_failures"] += 1
+                    self._discard(conn)
+                    continue
+                with self._lock:
+                    self.stats["checkouts"] += 1
+                    self.stats["in_use"] += 1
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn):
+        try:
+            if conn.closed or conn.get_transaction_status() == TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+                return
+            if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                try:
+                    self.rollback(conn)
+                except Exception as e:
+                    logger.warning(f"回滚归还的连接失败，将重建连接: {e}")
+                    self._discard(conn)
+                    return
+            with self._lock:
+                if id(conn) in self._meta:
+                    self._meta[id(conn)]["last_used"] = time.monotonic()
+            self._pool.putconn(conn)
+        finally:
+            with self._lock:
+                self.stats["in_use"] -= 1
+            self._slots.release()
+
+    def rollback(self, conn):
+        """回滚连接上的事务，并释放该连接的全部预备语句
+
+        出错的事务里 PREPARE 是否已经执行无法从客户端判断，回滚后执行 DEALLOCATE ALL 并清空
+        记录的语句名，之后按需重新预备，连接上的预备语句与记录始终一致。
+        """
+        conn.rollback()
+        with self._lock:
+            meta = self._meta.get(id(conn))
+            had_prepared = bool(meta and meta.pop("prepared", None))
+        if had_prepared:
+            with conn.cursor() as cursor:
+                cursor.execute("DEALLOCATE ALL")
+            conn.commit()
+
+    def closeall(self):
+        self._pool.closeall()
+        with self._lock:
+            self._meta.clear()
+
+    def execute_prepared(self, cursor, sql: str, params=None):
+        """以预备语句执行 sql（%s 占位符）
+
+        预备语句属于数据库会话，连接归还连接池后仍然有效；每个连接记录已预备的语句名，
+        PREPARE 成功后才记录，连接被回滚（见 rollback）或回收重建时随之清空。语句名由 SQL 文本决定，因此每种排序/过滤组合各对应一个语句。
+        """
+        if not self.prepared_statements:
+            cursor.execute(sql, params)
+            return
+        name = _statement_name(sql)
+        with self._lock:
+            hit = name in self._meta[id(cursor.connection)].get("prepared", ())
+        if not hit:
+            cursor.execute(f"PREPARE {name} AS {_numbered_placeholders(sql)}")
+            with self._lock:
+                self._meta[id(cursor.connection)].setdefault("prepared", set()).add(name)
+        params = list(params or [])
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}", params)
+        with self._lock:
+            self.stats["prepared_executions" if hit else "statements_prepared"] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            executions = self.stats["statements_prepared"] + self.stats["prepared_executions"]
+            hit_rate = self.stats["prepared_executions"] / executions if executions else None
+            return dict(self.stats, open=len(self._meta), minconn=self.minconn, maxconn=self.maxconn,
+                        plan_cache_hit_rate=hit_rate)
+
+
 class NewsDatabase:
-    """This class manages the PostgreSQL database connection and setup.
-    it maintain a single connection instance for reuse.
+    """This class manages the PostgreSQL database setup and a thread-safe connection pool.
+
+    Connections are checked out with ``NewsDatabase.connection()``, which commits on success,
+    rolls back on error and always returns the connection to the pool.
     """
-    _conn = None
+    _pool = None
+    _pool_lock = threading.Lock()
     _db_config = _get_db_config()
     _db_name = _db_config.get("database")
     _admin_conn = None
 
     @classmethod
-    def get_connection(cls, reset=False):
-        if reset:
-            cls.close_connection()
-            cls._drop_database()
-        if cls._conn is None:
-            if not cls._if_database_exists():
-                cls._create_database()
-            cls._connect()
-        if cls._conn is None:
-            raise Exception("✗ Database connection is not established.")
-        return cls._conn
-    
+    def get_pool(cls) -> _ConnectionPool:
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    cls._db_config = _get_db_config()
+                    cls._db_name = cls._db_config.get("database")
+                    if not cls._if_database_exists():
+                        cls._create_database()
+                    try:
+                        pool = _ConnectionPool(cls._db_config, **_get_pool_config())
+                        logger.info("Successfully created the database connection pool.")
+                    except Exception as e:
+                        logger.error(f"Failed to connect to the database: {e}")
+                        raise
+                    if os.getenv("DB_AUTO_MIGRATE", "1") != "0":
+                        cls._migrate(pool)
+                    cls._pool = pool
+                    atexit.register(cls.close_pool)
+        return cls._pool
+
+    @classmethod
+    def _migrate(cls, pool: _ConnectionPool):
+        """每个进程首次创建连接池时执行一次未执行的迁移，并预建未来几个月的分区"""
+        from atss.migrate import ensure_future_partitions, migrate
+
+        conn = pool.getconn()
+        try:
+            applied = migrate(conn)
+            if applied:
+                logger.info(f"已执行数据库迁移: {applied}")
+            ensure_future_partitions(conn)
+        finally:
+            pool.putconn(conn)
+
+    @classmethod
+    def prepare_database(cls):
+        """创建数据库（不存在时）、执行未执行的迁移并预建分区，不创建连接池
+
+        供不使用本连接池的客户端（如 AsyncArticleStorage）在启动时调用。
+        """
+        from atss.migrate import ensure_future_partitions, migrate
+
+        conn = cls.connect_unpooled()
+        try:
+            applied = migrate(conn)
+            if applied:
+                logger.info(f"已执行数据库迁移: {applied}")
+            ensure_future_partitions(conn)
+        finally:
+            conn.close()
+
+    @classmethod
+    def connect_unpooled(cls):
+        """创建一个不经过连接池的独立连接（数据库不存在时先创建），供迁移等维护任务使用"""
+        cls._db_config = _get_db_config()
+        cls._db_name = cls._db_config.get("database")
+        if not cls._if_database_exists():
+            cls._create_database()
+        return _psycopg2_connect(cls._db_config)
+
+    @classmethod
+    @contextmanager
+    def connection(cls):
+        """从连接池取出一个连接，退出时提交（出错时回滚）并归还"""
+        pool = cls.get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                pool.rollback(conn)
+            raise
+        finally:
+            pool.putconn(conn)
+
+    @classmethod
+    def execute_prepared(cls, cursor, sql: str, params=None):
+        """在连接池的连接上以预备语句执行查询（见 _ConnectionPool.execute_prepared）"""
+        cls.get_pool().execute_prepared(cursor, sql, params)
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict:
+        return cls._pool.get_stats() if cls._pool else {}
+
+    @classmethod
+    def reset_database(cls):
+        """关闭连接池并删除数据库（下次取连接时重新创建）"""
+        cls.close_pool()
+        cls._db_config = _get_db_config()
+        cls._db_name = cls._db_config.get("database")
+        cls._drop_database()
+
     @classmethod
     def get_admin_connection(cls):
-        if cls._admin_conn is None:
+        if cls._admin_conn is None or cls._admin_conn.closed:
             try:
                 cls._admin_conn = _psycopg2_connect(
                     cls._db_config | {"database": "postgres"}
@@ -76,10 +555,11 @@ class NewsDatabase:
         return cls._admin_conn
 
     @classmethod
-    def close_connection(cls):
-        if cls._conn:
-            cls._conn.close()
-            cls._conn = None
+    def close_pool(cls):
+        with cls._pool_lock:
+            if cls._pool:
+                cls._pool.closeall()
+                cls._pool = None
 
     @classmethod
     def close_admin_connection(cls):
@@ -87,20 +567,6 @@ class NewsDatabase:
             cls._admin_conn.close()
             cls._admin_conn = None
 
-    @classmethod
-    def _connect(cls):
-        """Connect to the PostgreSQL database, creating it if it doesn't exist."""
-
-        cls._db_config = _get_db_config()
-        cls._db_name = cls._db_config.pop("database")
-
-        try:
-            cls._conn = _psycopg2_connect(cls._db_config | {"database": cls._db_name})
-            logger.info("Successfully connected to the database.")
-        except Exception as e:
-            logger.error(f"Failed to connect to the database: {e}")
-            raise
-
     @classmethod
     def _if_database_exists(cls):
         try:
@@ -133,7 +599,7 @@ class NewsDatabase:
             cursor = conn.cursor()
             cursor.execute(f"CREATE DATABASE {cls._db_name}")
             cursor.close()
-            conn.close()
+            cls.close_admin_connection()
 
         except Exception as e:
             logger.error(f"✗ Failed to create database: {e}")
@@ -149,251 +615,814 @@ class NewsDatabase:
             cursor = conn.cursor()
             cursor.execute(f"DROP DATABASE IF EXISTS {cls._db_name}")
             cursor.close()
-            conn.close()
+            cls.close_admin_connection()
 
         except Exception as e:
             logger.error(f"✗ Failed to drop database: {e}")
             raise
 
-class ArticleStorage:
-    """数据库读取类"""
+_COPY_COLUMNS = ('title', 'content', 'url', 'source', 'published_date', 'scraped_at', 'content_hash',
+                 'cleaned_title', 'cleaned_content', 'is_valid', 'cleaner_version')
+
+
+def _normalize_date(value):
+    """将日期转换为 YYYY-MM-DD 字符串，无法解析时返回 None"""
+    if not value:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def _normalize_timestamp(value):
+    """将时间转换为 ISO 字符串，无法解析时返回 None（写入时使用当前时间）"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    try:
+        return datetime.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        return None
+
+
+def _copy_escape(value) -> str:
+    """转义为 COPY 文本格式的字段"""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
 
-    def __init__(self, reset=False):
-        self._create_tables()
-        self._conn = NewsDatabase.get_connection(reset=reset)
 
-    def _create_tables(self):
-        """创建表结构"""
-        try:
-            conn = NewsDatabase.get_connection()
-            cursor = conn.cursor()
+def _content_hash(title: str, content, source, published_date) -> str:
+    """文章内容的哈希，用于判断重复写入时文章是否变化（与迁移 0007 中的回填一致）"""
+    text = '\x1f'.join((title, content or '', source or '', published_date or ''))
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
 
-            # 创建文章表
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS articles (
-                    id SERIAL PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    content TEXT,
-                    url TEXT UNIQUE NOT NULL,
-                    source VARCHAR(255),
-                    published_date DATE,
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            )
-            print("✓ 表 articles 创建成功")
 
-            # 创建索引
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_articles_source 
-                ON articles(source)
-            """
-            )
-            print("✓ 索引 idx_articles_source 创建成功")
+_CLEANER = DataCleaner()
 
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_articles_published_date 
-                ON articles(published_date)
-            """
-            )
-            print("✓ 索引 idx_articles_published_date 创建成功")
 
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_articles_created_at 
-                ON articles(created_at)
-            """
-            )
-            print("✓ 索引 idx_articles_created_at 创建成功")
+def _article_content_hash(article: Dict) -> str:
+    """按写入时的规则计算文章的内容哈希（文章须有 title）"""
+    return _content_hash(article.get('title'), article.get('content'), article.get('source'),
+                         _normalize_date(article.get('published_date')))
 
-            # 在移除html标签的content和title上创建全文搜索索引
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_articles_fulltext 
-                ON articles USING GIN (
-                    to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))
-                )
-            """
-            )
 
-            conn.commit()
-            cursor.close()
-            NewsDatabase.close_connection()
+def _cleaned_fields(article: Dict) -> tuple:
+    """入库时清洗文章，返回 (cleaned_title, cleaned_content, is_valid, cleaner_version)
 
-            print("\n✓ 所有表和索引创建完成")
+    清洗出错时各项为空，cleaner_version 为空的文章会由回填任务重新清洗。
+    """
+    try:
+        cleaned = _CLEANER.clean_for_storage(article)
+    except Exception as e:
+        logger.warning(f"入库清洗文章失败 {article.get('url')}: {e}")
+        return (None, None, None, None)
+    return (cleaned['cleaned_title'], cleaned['cleaned_content'], cleaned['is_valid'], cleaned['cleaner_version'])
+
+
+def _article_to_copy_row(article: Dict):
+    """将文章转换为暂存表一行的原始字段（不含清洗结果，见 _with_cleaned_fields）；缺少必需字段时返回 None"""
+    if not article.get('url') or not article.get('title'):
+        return None
+    published_date = _normalize_date(article.get('published_date'))
+    return (
+        article.get('title'),
+        article.get('content'),
+        article.get('url'),
+        article.get('source'),
+        published_date,
+        _normalize_timestamp(article.get('scraped_at')),
+        _article_content_hash(article),
+    )
 
-        except Exception as e:
-            print(f"✗ 创建表失败: {e}")
-            raise
+
+def _with_cleaned_fields(rows: List[tuple], stored_hashes: Dict[str, str]) -> List[tuple]:
+    """为行补上清洗结果，只清洗新文章和内容哈希变化的文章
+
+    stored_hashes 为库中已有 URL 的 content_hash；哈希相同的文章不会被写入，清洗结果留空。
+    查询哈希之后文章被并发改写时，写入的行可能没有清洗结果，由回填任务或管道补上。
+    """
+    return [
+        row + (_cleaned_fields({'title': row[0], 'content': row[1], 'url': row[2]})
+               if row[2] not in stored_hashes or stored_hashes[row[2]] != row[6] else (None, None, None, None))
+        for row in rows
+    ]
+
+
+# 暂存表在连接内复用，提交时自动清空
+_STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS articles_staging (
+        title TEXT,
+        content TEXT,
+        url TEXT,
+        source VARCHAR(255),
+        published_date DATE,
+        scraped_at TIMESTAMP,
+        content_hash TEXT,
+        cleaned_title TEXT,
+        cleaned_content TEXT,
+        is_valid BOOLEAN,
+        cleaner_version INTEGER
+    ) ON COMMIT DELETE ROWS
+"""
+
+_COPY_STAGING_SQL = f"COPY articles_staging ({', '.join(_COPY_COLUMNS)}) FROM STDIN"
+
+_STORED_HASHES_SQL = "SELECT url, content_hash FROM article_urls WHERE url = ANY(%s)"
+
+# URL 唯一性由 article_urls 保证：新 URL 先占位并分配 id，再写入 articles
+_INSERT_NEW_ARTICLES_SQL = """
+    WITH new_urls AS (
+        INSERT INTO article_urls (url, article_id, published_date, content_hash)
+        SELECT url, nextval('articles_id_seq'), published_date, content_hash
+        FROM articles_staging
+        ON CONFLICT (url) DO NOTHING
+        RETURNING url, article_id
+    ), inserted AS (
+        INSERT INTO articles (id, title, content, url, source, published_date, scraped_at, content_hash,
+                              cleaned_title, cleaned_content, is_valid, cleaner_version)
+        SELECT n.article_id, s.title, s.content, s.url, s.source, s.published_date,
+               COALESCE(s.scraped_at, CURRENT_TIMESTAMP), s.content_hash,
+               s.cleaned_title, s.cleaned_content, s.is_valid, s.cleaner_version
+        FROM new_urls n
+        JOIN articles_staging s ON s.url = n.url
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM inserted
+"""
+
+# 已有 URL：只有 article_urls 中的内容哈希变化时才改写文章，未变化的文章不读取也不产生死元组；
+# 按 article_urls 中记录的 (published_date, id) 定位原分区中的行，
+# 日期非空和为空两种情况分开写，使规划器能裁剪分区；修改 published_date 时行会移到新分区
+_UPDATE_EXISTING_ARTICLES_SQL = [
+    f"""
+    UPDATE articles a SET
+        title = s.title,
+        content = s.content,
+        source = s.source,
+        published_date = s.published_date,
+        scraped_at = COALESCE(s.scraped_at, CURRENT_TIMESTAMP),
+        content_hash = s.content_hash,
+        cleaned_title = s.cleaned_title,
+        cleaned_content = s.cleaned_content,
+        is_valid = s.is_valid,
+        cleaner_version = s.cleaner_version
+    FROM articles_staging s
+    JOIN article_urls u ON u.url = s.url AND u.content_hash IS DISTINCT FROM s.content_hash
+    WHERE {locate} AND a.id = u.article_id
+    """
+    for locate in (
+        "a.published_date = u.published_date",
+        "a.published_date IS NULL AND u.published_date IS NULL",
+    )
+]
+
+_UPDATE_ARTICLE_URLS_SQL = """
+    UPDATE article_urls u SET published_date = s.published_date, content_hash = s.content_hash
+    FROM articles_staging s
+    WHERE u.url = s.url AND u.content_hash IS DISTINCT FROM s.content_hash
+"""
+
+
+def _bulk_upsert_chunk(cursor, rows: List[tuple]) -> Dict[str, int]:
+    """在当前事务中写入一块文章（URL不重复），返回新增/更新/未变化的数量"""
+    cursor.execute(_STORED_HASHES_SQL, ([row[2] for row in rows],))
+    rows = _with_cleaned_fields(rows, dict(cursor.fetchall()))
+
+    cursor.execute(_STAGING_TABLE_SQL)
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_escape(v) for v in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(_COPY_STAGING_SQL, buffer)
+
+    cursor.execute(_INSERT_NEW_ARTICLES_SQL)
+    inserted = cursor.fetchone()[0]
+
+    updated = 0
+    for sql in _UPDATE_EXISTING_ARTICLES_SQL:
+        cursor.execute(sql)
+        updated += cursor.rowcount
+
+    cursor.execute(_UPDATE_ARTICLE_URLS_SQL)
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(rows) - inserted - updated,
+    }
+
+
+def _dedupe_copy_rows(articles: List[Dict]) -> Tuple[List[tuple], int]:
+    """转换为 COPY 行并按 URL 去重（以最后一条为准），返回 (行列表, 无效文章数)"""
+    failed = 0
+    rows_by_url = {}
+    for article in articles:
+        row = _article_to_copy_row(article)
+        if row is None:
+            failed += 1
+        else:
+            rows_by_url.pop(row[2], None)
+            rows_by_url[row[2]] = row
+    return list(rows_by_url.values()), failed
+
+
+def _partition_months(published_dates) -> List[date]:
+    """写入前需要确保存在分区的月份（晚于预建范围的异常日期留在默认分区）"""
+    from atss.migrate import partition_window_end
+
+    window_end = partition_window_end()
+    months = set()
+    for value in published_dates:
+        if value:
+            month = date.fromisoformat(value).replace(day=1)
+            if month < window_end:
+                months.add(month)
+    return sorted(months)
+
+
+# 列表排序允许的列（列名无法参数化，必须走白名单）
+_SORT_COLUMNS = {'id', 'title', 'source', 'published_date', 'scraped_at', 'created_at'}
+
+
+def _normalize_sort(sort_by: str, sort_dir: str) -> Tuple[str, str]:
+    if sort_by not in _SORT_COLUMNS:
+        sort_by = 'published_date'
+    sort_dir = 'ASC' if str(sort_dir).lower() == 'asc' else 'DESC'
+    return sort_by, sort_dir
+
+
+def _encode_cursor(sort_by: str, sort_dir: str, value, article_id: int) -> str:
+    """把上一页最后一行的 (排序列值, id) 编码为不透明的游标"""
+    raw = json.dumps({'s': sort_by, 'd': sort_dir, 'v': value, 'i': article_id}, ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, sort_by: str, sort_dir: str) -> Dict:
+    """解析游标，游标无效或与当前排序不一致时抛出 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        data['i'] = int(data['i'])
+    except Exception as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+    if data.get('s') != sort_by or data.get('d') != sort_dir:
+        raise ValueError("分页游标与当前排序方式不一致")
+    return data
+
+
+# 流式读取时使用的紧凑记录（比字典省内存）
+ArticleRecord = namedtuple(
+    'ArticleRecord', ['id', 'title', 'content', 'url', 'source', 'published_date', 'scraped_at']
+)
+ArticleSummary = namedtuple(
+    'ArticleSummary', ['id', 'title', 'url', 'source', 'published_date', 'scraped_at', 'snippet', 'content_length']
+)
+
+# 读取方法的列投影："full" 包含正文，"list" 只含列表页需要的摘要（snippet 为正文前 250 个字符）
+_PROJECTIONS = {
+    'full': (ArticleRecord, """id, title, content, url, source,
+                    published_date::text as published_date,
+                    scraped_at::text as scraped_at"""),
+    'list': (ArticleSummary, """id, title, url, source,
+                    published_date::text as published_date,
+                    scraped_at::text as scraped_at,
+                    snippet, content_length"""),
+}
+
+
+def _projection(projection: str) -> Tuple[type, str]:
+    """返回投影对应的记录类型和 SELECT 列"""
+    try:
+        return _PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"未知的列投影: {projection}，可选: {', '.join(_PROJECTIONS)}") from None
+
+
+def _like_pattern(text: str) -> str:
+    """构造子串匹配的 ILIKE 模式，转义用户输入中的通配符"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _query_condition(query_text: str = None) -> Tuple[List[str], List]:
+    """文本查询（title/content/source 模糊匹配）对应的 WHERE 条件和参数
+
+    三个 ILIKE 分别由各列的 pg_trgm GIN 索引（迁移 0004）支持，规划器用 BitmapOr 合并，
+    不再需要全表扫描。查询文本少于 3 个字符时三元组索引无法筛选，仍会退化为顺序扫描。
+    """
+    if not query_text:
+        return [], []
+    pattern = _like_pattern(query_text)
+    return ["(title ILIKE %s OR content ILIKE %s OR source ILIKE %s)"], [pattern, pattern, pattern]
+
+
+def _search_query(query, limit: int, date_from, date_to, columns: str) -> Tuple[str, List]:
+    """构造全文搜索的 SQL 和参数"""
+    conditions = ["search_vector @@ q"]
+    params = [query]
+    # 日期条件与 search_vector 的 GIN 索引、published_date 索引组合使用
+    if date_from is not None:
+        conditions.append("published_date >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("published_date <= %s")
+        params.append(date_to)
+    params.append(limit)
+    sql = f"""
+        SELECT {columns},
+                ts_rank_cd(search_vector, q) as rank
+        FROM articles, plainto_tsquery('english', %s) q
+        WHERE {' AND '.join(conditions)}
+        ORDER BY rank DESC, published_date DESC NULLS LAST, id DESC
+        LIMIT %s
+    """
+    return sql, params
+
+
+def _page_queries(query_text: Optional[str], sort_by: str, sort_dir: str, after: Optional[Dict],
+                  columns: str) -> List[Tuple[str, List]]:
+    """Build the keyset pagination queries for one page.
+
+    Returns (sql, params) pairs to run in order until the page is full; each sql ends with
+    ``LIMIT %s`` and the caller appends the number of rows still needed. Sorting by a nullable
+    column needs two index range scans: non-NULL sort values first, then the NULL group by id.
+    """
+    cmp = '<' if sort_dir == 'DESC' else '>'
+    base_conditions, base_params = _query_condition(query_text)
+
+    # order_by qualifies the column with the table name, otherwise published_date/scraped_at would
+    # resolve to the ::text output columns and the composite index could not be used
+    def query(conditions, params, order_by):
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT {columns},
+                    {sort_by}::text as _sort_key
+            FROM articles
+            {where}
+            ORDER BY {order_by}
+            LIMIT %s
+        """
+        return sql, params
+
+    if sort_by == 'id':
+        conditions, params = list(base_conditions), list(base_params)
+        if after:
+            conditions.append(f"id {cmp} %s")
+            params.append(after['i'])
+        return [query(conditions, params, f"id {sort_dir}")]
+
+    queries = []
+    in_null_group = after is not None and after['v'] is None
+    if not in_null_group:
+        conditions = base_conditions + [f"{sort_by} IS NOT NULL"]
+        params = list(base_params)
+        if after:
+            conditions.append(f"({sort_by}, id) {cmp} (%s, %s)")
+            params += [after['v'], after['i']]
+        queries.append(query(conditions, params, f"articles.{sort_by} {sort_dir}, id {sort_dir}"))
+    conditions = base_conditions + [f"{sort_by} IS NULL"]
+    params = list(base_params)
+    if in_null_group:
+        conditions.append(f"id {cmp} %s")
+        params.append(after['i'])
+    queries.append(query(conditions, params, f"id {sort_dir}"))
+    return queries
+
+
+def _page_result(rows: List[Dict], limit: int, sort_by: str, sort_dir: str) -> Tuple[List[Dict], Optional[str]]:
+    """Trim the extra look-ahead row, build next_cursor and drop the internal sort key."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort_by, sort_dir, last['_sort_key'], last['id'])
+    for row in rows:
+        del row['_sort_key']
+    return rows, next_cursor
+
+
+# articles 是分区表，行数为各分区 reltuples 之和（从未 ANALYZE 过的分区为 -1）
+_ESTIMATE_TABLE_ROWS_SQL = """
+    SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0)::bigint
+    FROM pg_class
+    WHERE relkind = 'r' AND oid IN (
+        SELECT inhrelid FROM pg_inherits WHERE inhparent = 'articles'::regclass
+        UNION ALL SELECT 'articles'::regclass
+    )
+"""
+
+
+def _count_queries(query_text: Optional[str], cap: int) -> Tuple[Tuple[str, List], Tuple[str, List]]:
+    """返回 (封顶的精确计数查询, 估算查询)，估算查询为 reltuples 求和或 EXPLAIN"""
+    conditions, params = _query_condition(query_text)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    capped = (f"SELECT COUNT(*) FROM (SELECT 1 FROM articles {where} LIMIT %s) capped", params + [cap + 1])
+    if not where:
+        return capped, (_ESTIMATE_TABLE_ROWS_SQL, [])
+    return capped, (f"EXPLAIN (FORMAT JSON) SELECT 1 FROM articles {where}", params)
+
+
+def _estimate_from_result(value) -> int:
+    """解析估算查询的结果：行数，或 EXPLAIN (FORMAT JSON) 的计划"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if isinstance(value, list):
+        return int(value[0]["Plan"]["Plan Rows"])
+    return int(value)
+
+
+# 分面统计允许的日期分桶（date_trunc 的精度）
+_FACET_BUCKETS = ('day', 'week', 'month', 'year')
+
+
+def _facet_queries(query_text: Optional[str], bucket: str,
+                   source_limit: int) -> Tuple[Tuple[str, List], Tuple[str, List]]:
+    """返回 (来源分面查询, 日期分面查询)
+
+    不带查询时读取增量维护的 article_stats 汇总表；带查询时只能在匹配的文章上分组计数。
+    """
+    if bucket not in _FACET_BUCKETS:
+        raise ValueError(f"未知的日期分桶: {bucket}")
+    conditions, params = _query_condition(query_text)
+    if not conditions:
+        sources = ("""
+            SELECT source, SUM(article_count)::bigint AS count
+            FROM article_stats
+            GROUP BY source
+            HAVING SUM(article_count) > 0
+            ORDER BY count DESC, source
+            LIMIT %s
+        """, [source_limit])
+        dates = (f"""
+            SELECT date_trunc('{bucket}', day)::date::text AS date, SUM(article_count)::bigint AS count
+            FROM article_stats
+            GROUP BY 1
+            HAVING SUM(article_count) > 0
+            ORDER BY 1 NULLS LAST
+        """, [])
+        return sources, dates
+    where = f"WHERE {' AND '.join(conditions)}"
+    sources = (f"""
+        SELECT source, COUNT(*) AS count
+        FROM articles
+        {where}
+        GROUP BY source
+        ORDER BY count DESC, source
+        LIMIT %s
+    """, params + [source_limit])
+    dates = (f"""
+        SELECT date_trunc('{bucket}', published_date)::date::text AS date, COUNT(*) AS count
+        FROM articles
+        {where}
+        GROUP BY 1
+        ORDER BY 1 NULLS LAST
+    """, list(params))
+    return sources, dates
+
+
+class ArticleStorage:
+    """数据库读取类
+
+    所有方法都从 NewsDatabase 的连接池中按需取出连接，可在多个线程中共享同一实例。
+    """
+
+    # 计数缓存在进程内共享（web 应用每个请求都会新建 ArticleStorage）
+    _count_config = _get_count_config()
+    _count_cache = _TTLCache(_count_config["cache_ttl"])
+    _facet_cache = _TTLCache(_count_config["cache_ttl"])
+    # 查询耗时统计同样在进程内共享
+    _query_log = _QueryLog(**_get_query_log_config())
+
+    def __init__(self, reset=False):
+        # 表结构由 atss.migrate 管理，首次创建连接池时自动迁移到最新版本
+        if reset:
+            NewsDatabase.reset_database()
+        NewsDatabase.get_pool()
+
+    def _fetch_dicts(self, sql: str, params=None, prepared: bool = False) -> List[Dict]:
+        """执行查询并以字典列表返回所有行
+
+        Args:
+            prepared: 为 True 时使用服务器端预备语句，用于 Web 请求等反复执行的热点查询
+        """
+        with NewsDatabase.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                return self._execute(cursor, sql, params, prepared,
+                                     lambda: [dict(row) for row in cursor.fetchall()])
+
+    def _execute(self, cursor, sql: str, params, prepared: bool, fetch):
+        """执行查询并用 fetch() 取回结果，耗时记入查询统计（慢查询记录日志）"""
+        started = time.perf_counter()
+        if prepared:
+            NewsDatabase.execute_prepared(cursor, sql, params)
+        else:
+            cursor.execute(sql, params)
+        result = fetch()
+        self._query_log.record(sql, params, time.perf_counter() - started, cursor=cursor, prepared=prepared)
+        return result
+
+    def _iter_rows(self, sql: str, params=None, itersize: int = None, compact: bool = False,
+                   record_type: type = ArticleRecord):
+        """用命名（服务器端）游标执行查询，按 itersize 分批取回并逐行产出
+
+        查询列必须与 record_type 的字段一致。生成器在遍历结束或被关闭前一直占用一个连接，
+        中途放弃遍历时应调用其 close()。
+
+        Args:
+            compact: 为 True 时产出 record_type 记录，否则产出字典
+        """
+        with NewsDatabase.connection() as conn:
+            with conn.cursor(name=f"article_stream_{id(conn)}_{time.monotonic_ns()}") as cursor:
+                cursor.itersize = itersize or _get_itersize()
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                # 只统计取回第一批结果的耗时，遍历时间取决于调用方
+                for i, row in enumerate(cursor):
+                    if i == 0:
+                        self._query_log.record(sql, params, time.perf_counter() - started)
+                    record = record_type._make(row)
+                    yield record if compact else record._asdict()
+
+    def _fetch_scalar(self, sql: str, params=None, prepared: bool = False):
+        """执行查询并返回第一行第一列"""
+        with NewsDatabase.connection() as conn:
+            with conn.cursor() as cursor:
+                row = self._execute(cursor, sql, params, prepared, cursor.fetchone)
+                return row[0] if row else None
 
     def _insert_article(self, article: Dict) -> bool:
         """插入单篇文章到数据库"""
+        stats = self.bulk_upsert_articles([article])
+        return stats['failed'] == 0
+
+    def save_articles(self, articles: List[Dict], chunk_size: int = 1000) -> int:
+        """批量插入文章到数据库
+
+        Returns:
+            成功写入（新增、更新或未变化）的文章数
+        """
+        stats = self.bulk_upsert_articles(articles, chunk_size=chunk_size)
+        return stats['inserted'] + stats['updated'] + stats['unchanged']
+
+    def bulk_upsert_articles(self, articles: List[Dict], chunk_size: int = 1000) -> Dict[str, int]:
+        """批量写入文章：COPY 到临时暂存表，再执行一次集合式 upsert，按块提交
+
+        URL重复时以最后一条为准；内容哈希（content_hash）未变化的已有文章不会被改写。
+
+        Args:
+            articles: 文章列表（title, content, url, source, published_date, scraped_at）
+            chunk_size: 每个事务写入的文章数
+
+        Returns:
+            {'inserted': 新增数, 'updated': 更新数, 'unchanged': 未变化数, 'failed': 失败数}
+        """
+        rows, failed = _dedupe_copy_rows(articles)
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': failed}
+
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("""
-                INSERT INTO articles (title, content, url, source, published_date, scraped_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON CONFLICT (url) DO UPDATE SET
-                    title = EXCLUDED.title,
-                    content = EXCLUDED.content,
-                    source = EXCLUDED.source,
-                    published_date = EXCLUDED.published_date,
-                    scraped_at = EXCLUDED.scraped_at
-            """, (
-                article['title'],
-                article['content'],
-                article['url'],
-                article['source'],
-                article['published_date'],
-                article['scraped_at']
-            ))
-            self._conn.commit()
-            cursor.close()
-            return True
+            self._ensure_partitions(row[4] for row in rows)
         except Exception as e:
-            logger.error(f"插入文章失败: {e}")
-            self._conn.rollback()
-            return False
-    
-    def save_articles(self, articles: List[Dict]) -> int:
-        """批量插入文章到数据库"""
-        from tqdm import tqdm
-        success_count = 0
-        for article in tqdm(articles, desc="Saving articles"):
-            if self._insert_article(article):
-                success_count += 1
-        logger.info(f"成功插入 {success_count}/{len(articles)} 篇文章到数据库")
-        return success_count
+            # 没有对应分区的文章会写入默认分区，不影响写入
+            logger.warning(f"创建分区失败: {e}")
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                started = time.perf_counter()
+                with NewsDatabase.connection() as conn:
+                    with conn.cursor() as cursor:
+                        chunk_stats = _bulk_upsert_chunk(cursor, chunk)
+                self._query_log.record("bulk_upsert_articles (COPY + upsert, %s rows)", (len(chunk),),
+                                       time.perf_counter() - started)
+                for key, value in chunk_stats.items():
+                    stats[key] += value
+            except Exception as e:
+                logger.error(f"批量写入文章失败（{len(chunk)} 篇）: {e}")
+                stats['failed'] += len(chunk)
+
+        logger.info(
+            f"批量写入 {len(articles)} 篇文章: 新增 {stats['inserted']}, 更新 {stats['updated']}, "
+            f"未变化 {stats['unchanged']}, 失败 {stats['failed']}"
+        )
+        return stats
         
+    def _ensure_partitions(self, published_dates):
+        """在写入前为这些发布日期所在的月份创建分区（在各自的短事务中，不阻塞读取）"""
+        from atss.migrate import ensure_partitions
+
+        months = _partition_months(published_dates)
+        if not months:
+            return
+        with NewsDatabase.connection() as conn:
+            ensure_partitions(conn, months)
+
+    def get_precleaned(self, articles: List[Dict]) -> Dict[str, Dict]:
+        """查询这些文章入库时保存的清洗结果，供 DataCleaner.clean_dataset 跳过重复清洗
+
+        只返回内容与数据库中一致（内容哈希相同）且清洗版本为当前 CLEANER_VERSION 的文章。
+
+        Returns:
+            {url: {'cleaned_title', 'cleaned_content', 'is_valid'}}
+        """
+        hashes = {a['url']: _article_content_hash(a) for a in articles if a.get('url') and a.get('title')}
+        if not hashes:
+            return {}
+        rows = self._fetch_dicts("""
+            SELECT u.url, a.cleaned_title, a.cleaned_content, a.is_valid
+            FROM unnest(%s::text[], %s::text[]) AS r(url, content_hash)
+            JOIN article_urls u ON u.url = r.url AND u.content_hash = r.content_hash
+            JOIN articles a ON a.id = u.article_id
+            WHERE a.cleaner_version = %s
+        """, (list(hashes), list(hashes.values()), CLEANER_VERSION))
+        return {row.pop('url'): row for row in rows}
+
+    def backfill_cleaned(self, batch_size: int = 500) -> int:
+        """为清洗版本不是当前 CLEANER_VERSION 的文章（包括迁移前写入的文章）重新生成清洗结果
+
+        按 id 分批读取和更新，每批一个事务，可随时中断后重新执行。
+
+        Returns:
+            更新的文章数
+        """
+        updated = 0
+        last_id = 0
+        while True:
+            rows = self._fetch_dicts("""
+                SELECT id, title, content, url, source, published_date
+                FROM articles
+                WHERE id > %s AND cleaner_version IS DISTINCT FROM %s
+                ORDER BY id
+                LIMIT %s
+            """, (last_id, CLEANER_VERSION, batch_size))
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            fields = [_cleaned_fields(row) for row in rows]
+            with NewsDatabase.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        UPDATE articles a SET
+                            cleaned_title = v.cleaned_title,
+                            cleaned_content = v.cleaned_content,
+                            is_valid = v.is_valid,
+                            cleaner_version = v.cleaner_version
+                        FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::boolean[], %s::integer[])
+                            AS v(id, cleaned_title, cleaned_content, is_valid, cleaner_version)
+                        WHERE a.id = v.id
+                    """, ([row['id'] for row in rows], *(list(column) for column in zip(*fields))))
+                    updated += cursor.rowcount
+            logger.info(f"已回填 {updated} 篇文章的清洗结果")
+        return updated
+
     def close(self):
-        """关闭数据库连接"""
-        if self._conn:
-            NewsDatabase.close_connection()
+        """释放资源
+
+        连接由共享的连接池管理，这里不会关闭其他 ArticleStorage 正在使用的连接；
+        进程退出时连接池会自动关闭（也可调用 NewsDatabase.close_pool()）。
+        """
+        pass
 
-    def search_article(self, query) -> List[Dict]:
-        """搜索文章"""
+    def get_stats(self, top: int = 20) -> Dict:
+        """获取存储层的运行统计：连接池使用情况，以及总耗时最高的 top 条语句的耗时分布"""
+        return {'pool': NewsDatabase.get_pool_stats(), 'queries': self._query_log.get_stats(top)}
+
+    def search_article(self, query, limit: int = 50, date_from=None, date_to=None,
+                       projection: str = 'full') -> List[Dict]:
+        """全文搜索文章，按相关度排序（标题命中权重高于正文）
+
+        Args:
+            query: 搜索关键词
+            limit: 最多返回多少条记录
+            date_from: 可选，发布日期下限（含）
+            date_to: 可选，发布日期上限（含）
+            projection: "full" 包含正文，"list" 只含摘要
+
+        Returns:
+            文章列表，每篇文章带有相关度得分 rank
+        """
+        _, columns = _projection(projection)
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(
-                """
-                SELECT id, title, content, url, source, 
-                        published_date::text as published_date, 
-                        scraped_at::text as scraped_at
-                FROM articles
-                WHERE to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, '')) @@ plainto_tsquery('english', %s)
-                ORDER BY published_date DESC, created_at DESC
-                LIMIT 50
-            """,
-                (query,)
-            )
-            results = cursor.fetchall()
-            cursor.close()
+            results = self._fetch_dicts(*_search_query(query, limit, date_from, date_to, columns), prepared=True)
             logger.info(f"搜索到 {len(results)} 篇相关文章")
-            return [dict(article) for article in results]
+            return results
         except Exception as e:
             logger.error(f"搜索文章失败: {e}")
             return []
 
-    def get_all_articles(self, limit: int = None) -> List[Dict]:
+    def iter_all_articles(self, limit: int = None, itersize: int = None, compact: bool = False,
+                          projection: str = 'full') -> Iterator:
+        """以恒定内存流式遍历所有文章（服务器端游标）
+
+        Args:
+            limit: 最多返回多少篇
+            itersize: 每批从数据库取回的行数，默认取 DB_ITERSIZE
+            compact: 为 True 时产出 ArticleRecord/ArticleSummary，否则产出字典
+            projection: "full" 包含正文，"list" 只含摘要
+        """
+        record_type, columns = _projection(projection)
+        query = f"SELECT {columns} FROM articles"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self._iter_rows(query, itersize=itersize, compact=compact, record_type=record_type)
+
+    def iter_articles_by_date_range(self, days: int = 7, itersize: int = None, compact: bool = False,
+                                    projection: str = 'full') -> Iterator:
+        """流式遍历指定天数内的文章，按发布日期倒序"""
+        record_type, columns = _projection(projection)
+        return self._iter_rows(f"""
+            SELECT {columns}
+            FROM articles
+            WHERE published_date >= CURRENT_DATE - INTERVAL '%s days'
+            ORDER BY articles.published_date DESC
+        """, (days,), itersize=itersize, compact=compact, record_type=record_type)
+
+    def iter_articles_by_source(self, source: str, itersize: int = None, compact: bool = False,
+                                projection: str = 'full') -> Iterator:
+        """流式遍历指定来源的文章，按发布日期倒序"""
+        record_type, columns = _projection(projection)
+        return self._iter_rows(f"""
+            SELECT {columns}
+            FROM articles
+            WHERE source = %s
+            ORDER BY articles.published_date DESC
+        """, (source,), itersize=itersize, compact=compact, record_type=record_type)
+
+    def get_all_articles(self, limit: int = None, projection: str = 'full') -> List[Dict]:
         """获取所有文章"""
+        _projection(projection)
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            # allow optional ordering via safe column names and direction
-            # default ordering
-            query = """
-                SELECT id, title, content, url, source, 
-                        published_date::text as published_date, 
-                        scraped_at::text as scraped_at
-                FROM articles
-            """
-            if limit:
-                query += f" LIMIT {limit}"
-            
-            cursor.execute(query)
-            articles = cursor.fetchall()
-            cursor.close()
+            articles = list(self.iter_all_articles(limit=limit, projection=projection))
             logger.info(f"从数据库获取了 {len(articles)} 篇文章")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"获取文章失败: {e}")
             return []
 
-    def get_articles_by_date_range(self, days: int = 7) -> List[Dict]:
+    def get_articles_by_date_range(self, days: int = 7, projection: str = 'full') -> List[Dict]:
         """获取指定天数内的文章"""
+        _projection(projection)
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
-                SELECT id, title, content, url, source, 
-                        published_date::text as published_date, 
-                        scraped_at::text as scraped_at
-                FROM articles
-                WHERE published_date >= CURRENT_DATE - INTERVAL '%s days'
-                ORDER BY published_date DESC
-            """, (days,))
-            articles = cursor.fetchall()
-            cursor.close()
+            articles = list(self.iter_articles_by_date_range(days, projection=projection))
             logger.info(f"从数据库获取了最近{days}天的 {len(articles)} 篇文章")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"获取文章失败: {e}")
             return []
 
-    def get_articles_by_source(self, source: str) -> List[Dict]:
+    def get_articles_by_source(self, source: str, projection: str = 'full') -> List[Dict]:
         """根据来源获取文章"""
+        _projection(projection)
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
-                SELECT id, title, content, url, source, 
-                        published_date::text as published_date, 
-                        scraped_at::text as scraped_at
-                FROM articles
-                WHERE source = %s
-                ORDER BY published_date DESC
-            """, (source,))
-            articles = cursor.fetchall()
-            cursor.close()
+            articles = list(self.iter_articles_by_source(source, projection=projection))
             logger.info(f"从数据库获取了来源为 {source} 的 {len(articles)} 篇文章")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"获取文章失败: {e}")
             return []
 
-    def get_articles_by_query(self, query_text: str, limit: int = 100) -> List[Dict]:
+    def get_articles_by_query(self, query_text: str, limit: int = 100, projection: str = 'full') -> List[Dict]:
         """根据文本查询文章（title/content/source）使用 ILIKE（不区分大小写）
 
         Args:
             query_text: 要搜索的文本
             limit: 最多返回多少条记录
+            projection: "full" 包含正文，"list" 只含摘要
 
         Returns:
             文章列表
         """
+        _, columns = _projection(projection)
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            # 使用参数化查询以防注入；将查询用%%包裹表示模糊匹配
-            pattern = f"%{query_text}%"
-            cursor.execute("""
-                SELECT id, title, content, url, source,
-                        published_date::text as published_date,
-                        scraped_at::text as scraped_at
+            # 使用参数化查询以防注入
+            conditions, params = _query_condition(query_text)
+            where = f"WHERE {conditions[0]}" if conditions else ""
+            articles = self._fetch_dicts(f"""
+                SELECT {columns}
                 FROM articles
-                WHERE title ILIKE %s OR content ILIKE %s OR source ILIKE %s
-                ORDER BY published_date DESC
+                {where}
+                ORDER BY articles.published_date DESC
                 LIMIT %s
-            """, (pattern, pattern, pattern, limit))
-            articles = cursor.fetchall()
-            cursor.close()
+            """, params + [limit])
             logger.info(f"通过查询 '{query_text}' 找到 {len(articles)} 篇文章")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"查询文章失败: {e}")
             return []
 
-    def get_articles_by_query_with_sort(self, query_text: str, limit: int = 100, offset: int = 0, sort_by: str = 'published_date', sort_dir: str = 'desc') -> List[Dict]:
+    def get_articles_by_query_with_sort(self, query_text: str, limit: int = 100, offset: int = 0, sort_by: str = 'published_date', sort_dir: str = 'desc', projection: str = 'full') -> List[Dict]:
         """Server-side search with secure ordering
 
         Args:
@@ -401,140 +1430,235 @@ class ArticleStorage:
             limit: max rows
             sort_by: allowed column name to sort by
             sort_dir: 'asc' or 'desc'
+            projection: "full" includes the content, "list" only the snippet
         """
         # sanitize sort_by and sort_dir to prevent SQL injection (no parameterization for column names)
-        allowed_cols = {'id', 'title', 'source', 'published_date', 'scraped_at', 'created_at'}
-        if sort_by not in allowed_cols:
-            sort_by = 'published_date'
-
-        sort_dir = 'ASC' if str(sort_dir).lower() == 'asc' else 'DESC'
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
 
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
-            pattern = f"%{query_text}%"
+            conditions, params = _query_condition(query_text)
+            where = f"WHERE {conditions[0]}" if conditions else ""
             sql = f"""
-                SELECT id, title, content, url, source,
-                        published_date::text as published_date,
-                        scraped_at::text as scraped_at
+                SELECT {columns}
                 FROM articles
-                WHERE title ILIKE %s OR content ILIKE %s OR source ILIKE %s
-                ORDER BY {sort_by} {sort_dir}
+                {where}
+                ORDER BY articles.{sort_by} {sort_dir} NULLS LAST, id {sort_dir}
                 LIMIT %s
                 OFFSET %s
             """
-            cursor.execute(sql, (pattern, pattern, pattern, limit, offset))
-            articles = cursor.fetchall()
-            cursor.close()
+            articles = self._fetch_dicts(sql, params + [limit, offset], prepared=True)
             logger.info(f"通过查询 '{query_text}' 找到 {len(articles)} 篇文章 (排序: {sort_by} {sort_dir})")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"查询文章失败: {e}")
             return []
 
-    def get_all_articles_with_sort(self, limit: int = None, sort_by: str = 'published_date', sort_dir: str = 'desc') -> List[Dict]:
+    def get_all_articles_with_sort(self, limit: int = None, sort_by: str = 'published_date', sort_dir: str = 'desc', projection: str = 'full') -> List[Dict]:
         """Return all articles with optional ordering. Uses whitelist for sort_by and sort_dir."""
-        allowed_cols = {'id', 'title', 'source', 'published_date', 'scraped_at', 'created_at'}
-        if sort_by not in allowed_cols:
-            sort_by = 'published_date'
-
-        sort_dir = 'ASC' if str(sort_dir).lower() == 'asc' else 'DESC'
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
 
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
             sql = f"""
-                SELECT id, title, content, url, source,
-                        published_date::text as published_date,
-                        scraped_at::text as scraped_at
+                SELECT {columns}
                 FROM articles
-                ORDER BY {sort_by} {sort_dir}
+                ORDER BY articles.{sort_by} {sort_dir} NULLS LAST, id {sort_dir}
             """
             if limit is not None:
                 # limit may be provided as per_page; if offset is required we'll use a separate path
                 sql += f" LIMIT %s"
-                cursor.execute(sql, (limit,))
+                articles = self._fetch_dicts(sql, (limit,))
             else:
-                cursor.execute(sql)
+                articles = self._fetch_dicts(sql)
 
-            articles = cursor.fetchall()
-            cursor.close()
             logger.info(f"从数据库获取了 {len(articles)} 篇文章 (排序: {sort_by} {sort_dir})")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"获取文章失败: {e}")
             return []
 
-    def get_all_articles_with_sort_and_offset(self, limit: int = None, offset: int = 0, sort_by: str = 'published_date', sort_dir: str = 'desc') -> List[Dict]:
+    def get_all_articles_with_sort_and_offset(self, limit: int = None, offset: int = 0, sort_by: str = 'published_date', sort_dir: str = 'desc', projection: str = 'full') -> List[Dict]:
         """Return articles with ordering, limit and offset for pagination."""
-        allowed_cols = {'id', 'title', 'source', 'published_date', 'scraped_at', 'created_at'}
-        if sort_by not in allowed_cols:
-            sort_by = 'published_date'
-
-        sort_dir = 'ASC' if str(sort_dir).lower() == 'asc' else 'DESC'
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
 
         try:
-            cursor = self._conn.cursor(cursor_factory=RealDictCursor)
             sql = f"""
-                SELECT id, title, content, url, source,
-                        published_date::text as published_date,
-                        scraped_at::text as scraped_at
+                SELECT {columns}
                 FROM articles
-                ORDER BY {sort_by} {sort_dir}
+                ORDER BY articles.{sort_by} {sort_dir} NULLS LAST, id {sort_dir}
             """
             if limit is not None:
                 sql += " LIMIT %s OFFSET %s"
-                cursor.execute(sql, (limit, offset))
+                articles = self._fetch_dicts(sql, (limit, offset), prepared=True)
             else:
-                cursor.execute(sql)
+                articles = self._fetch_dicts(sql)
 
-            articles = cursor.fetchall()
-            cursor.close()
             logger.info(f"从数据库获取了 {len(articles)} 篇文章 (排序: {sort_by} {sort_dir}, offset={offset})")
-            return [dict(article) for article in articles]
+            return articles
         except Exception as e:
             logger.error(f"获取文章失败: {e}")
             return []
 
-    def get_article_count_by_query(self, query_text: str) -> int:
-        """Count articles matching a query_text across title/content/source."""
+    def get_articles_page(self, query_text: str = None, limit: int = 25, sort_by: str = 'published_date',
+                          sort_dir: str = 'desc', cursor: str = None,
+                          projection: str = 'full') -> Tuple[List[Dict], Optional[str]]:
+        """Keyset (seek) pagination over all articles or the articles matching query_text.
+
+        Rows are ordered by (sort_by, id) with NULL sort values last in both directions. Instead of
+        skipping earlier rows with OFFSET, each page starts right after the (sort value, id) of the
+        previous page's last row, so every page costs the same index range scan.
+
+        Args:
+            query_text: optional search string matched against title/content/source
+            limit: page size
+            sort_by: allowed column name to sort by
+            sort_dir: 'asc' or 'desc'
+            cursor: the next_cursor returned for the previous page, None for the first page
+            projection: "full" includes the content, "list" only the snippet
+
+        Returns:
+            (articles, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: if the cursor is malformed or was issued for a different sort order,
+                or the projection is unknown
+        """
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
+        after = _decode_cursor(cursor, sort_by, sort_dir) if cursor else None
+
+        queries = _page_queries(query_text, sort_by, sort_dir, after, columns)
+
+        # fetch one extra row to know whether there is a next page
+        want = limit + 1
+        rows = []
         try:
-            cursor = self._conn.cursor()
-            pattern = f"%{query_text}%"
-            cursor.execute("""
-                SELECT COUNT(*) FROM articles
-                WHERE title ILIKE %s OR content ILIKE %s OR source ILIKE %s
-            """, (pattern, pattern, pattern))
-            count = cursor.fetchone()[0]
-            cursor.close()
-            return count
+            for sql, params in queries:
+                if len(rows) >= want:
+                    break
+                rows += self._fetch_dicts(sql, params + [want - len(rows)], prepared=True)
         except Exception as e:
-            logger.error(f"查询计数失败: {e}")
-            return 0
+            logger.error(f"分页获取文章失败: {e}")
+            return [], None
+
+        rows, next_cursor = _page_result(rows, limit, sort_by, sort_dir)
+        logger.info(f"分页获取了 {len(rows)} 篇文章 (排序: {sort_by} {sort_dir}, 游标: {'有' if cursor else '无'})")
+        return rows, next_cursor
+
+    def count_articles(self, query_text: str = None, cap: int = None) -> Dict:
+        """统计全部文章或匹配 query_text 的文章数量，供分页使用
+
+        不超过 cap 条时返回精确值；超过时不再扫描全表，而是返回查询计划的估算值，
+        因此计数开销不随表的大小增长。结果按查询缓存 DB_COUNT_CACHE_TTL 秒。
+
+        Args:
+            query_text: 可选的查询文本（title/content/source 模糊匹配）
+            cap: 精确计数的上限，默认取 DB_COUNT_CAP
+
+        Returns:
+            {'count': 数量, 'exact': 是否为精确值}
+        """
+        cap = self._count_config["cap"] if cap is None else cap
+        key = (query_text or '', cap)
+        cached = self._count_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        capped, estimate = _count_queries(query_text, cap)
+        try:
+            count = self._fetch_scalar(*capped, prepared=True)
+            if count <= cap:
+                result = {'count': count, 'exact': True}
+            else:
+                result = {'count': max(_estimate_from_result(self._fetch_scalar(*estimate)), cap + 1), 'exact': False}
+        except Exception as e:
+            logger.error(f"统计文章数量失败: {e}")
+            return {'count': 0, 'exact': False}
+
+        self._count_cache.set(key, result)
+        return dict(result)
+
+    def get_article_count_by_query(self, query_text: str) -> int:
+        """Count articles matching a query_text across title/content/source.
+
+        Same as count_articles(query_text)['count']: exact up to DB_COUNT_CAP, estimated above it,
+        and cached for DB_COUNT_CACHE_TTL seconds. This used to be an exact COUNT(*); callers that
+        need an exact number use count_articles(query_text, cap=...) and check 'exact'.
+        """
+        return self.count_articles(query_text)['count']
 
     def get_article_count(self) -> int:
-        """获取文章总数"""
+        """获取文章总数（同 count_articles()['count']）
+
+        以前总是精确的 COUNT(*)；现在超过 DB_COUNT_CAP 时返回估算值，并缓存 DB_COUNT_CACHE_TTL 秒。
+        需要精确值时调用 count_articles(cap=...) 并检查 'exact'。
+        """
+        return self.count_articles()['count']
+
+    def get_facets(self, query_text: str = None, bucket: str = 'month', source_limit: int = 50) -> Dict:
+        """分面统计：各来源的文章数，以及按日期分桶的文章数
+
+        不带查询时直接读取 article_stats 汇总表（毫秒级，与文章总数无关）；带查询时在匹配
+        title/content/source 的文章上分组计数。结果按查询缓存 DB_COUNT_CACHE_TTL 秒。
+
+        Args:
+            query_text: 可选的查询文本
+            bucket: 日期分桶，'day'/'week'/'month'/'year'
+            source_limit: 最多返回多少个来源（按文章数倒序）
+
+        Returns:
+            {'bucket': bucket, 'sources': [{'source', 'count'}], 'dates': [{'date', 'count'}]}；
+            date 为分桶起始日期，发布日期为空的文章计入 date 为 None 的一项
+
+        Raises:
+            ValueError: 日期分桶未知
+        """
+        (sources_sql, sources_params), (dates_sql, dates_params) = _facet_queries(query_text, bucket, source_limit)
+        key = (query_text or '', bucket, source_limit)
+        cached = self._facet_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM articles")
-            count = cursor.fetchone()[0]
-            cursor.close()
-            return count
+            result = {
+                'bucket': bucket,
+                'sources': self._fetch_dicts(sources_sql, sources_params, prepared=True),
+                'dates': self._fetch_dicts(dates_sql, dates_params, prepared=True),
+            }
         except Exception as e:
-            logger.error(f"获取文章数量失败: {e}")
-            return 0
+            logger.error(f"分面统计失败: {e}")
+            return {'bucket': bucket, 'sources': [], 'dates': []}
+
+        self._facet_cache.set(key, result)
+        return result
 
     def get_sources(self) -> List[str]:
-        """获取所有新闻源"""
+        """获取所有新闻源（读取 article_stats 汇总表）"""
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT DISTINCT source FROM articles ORDER BY source")
-            sources = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            return sources
+            rows = self._fetch_dicts("""
+                SELECT source FROM article_stats
+                GROUP BY source
+                HAVING SUM(article_count) > 0
+                ORDER BY source
+            """)
+            return [row["source"] for row in rows]
         except Exception as e:
             logger.error(f"获取新闻源失败: {e}")
             return []
 
 
+def get_article_storage(reset=False):
+    """按 DB_BACKEND 配置创建文章存储：postgres（默认，ArticleStorage）或 sqlite（SQLiteArticleStorage）"""
+    backend = os.getenv("DB_BACKEND", "postgres").lower()
+    if backend == "sqlite":
+        from atss.sqlite_storage import SQLiteArticleStorage
+        return SQLiteArticleStorage(reset=reset)
+    if backend not in ("postgres", "postgresql"):
+        raise ValueError(f"未知的存储后端: {backend}")
+    return ArticleStorage(reset=reset)
+
 
 if __name__ == "__main__":
     # 测试数据库读取
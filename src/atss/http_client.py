@@ -0,0 +1,47 @@
+"""
+共享HTTP客户端
+功能：提供进程内共享的 requests.Session，复用连接池和默认请求头
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from atss import logger
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _create_session() -> requests.Session:
+    try:
+        from atss.config import get_config
+
+        scraper_config = get_config().get("scraper", {})
+    except Exception as e:
+        logger.warning(f"Failed to load scraper config for HTTP client, using defaults: {e}")
+        scraper_config = {}
+
+    session = requests.Session()
+    session.headers["User-Agent"] = scraper_config.get("user_agent", DEFAULT_USER_AGENT)
+    # 连接池大小与并发抓取的线程数相当
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_client() -> requests.Session:
+    """获取共享的HTTP会话（首次调用时创建）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
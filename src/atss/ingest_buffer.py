@@ -0,0 +1,238 @@
+"""
+写入缓冲
+功能：进程内的 write-behind 缓冲区，多个线程/协程提交的文章由后台线程攒批后通过
+bulk_upsert_articles 写入数据库，使抓取与写库并行进行
+
+- 队列有上限（DB_INGEST_MAX_PENDING），写满时 put() 阻塞，形成背压
+- 攒够 DB_INGEST_BATCH_SIZE 篇或最早一篇等待超过 DB_INGEST_FLUSH_INTERVAL 秒时写入一批
+- flush() 等待此前提交的文章全部写入；close()（以及进程退出时）写完剩余文章
+- get_stats() 返回写入数量、背压次数和写入延迟
+
+用法:
+    with WriteBehindBuffer(get_article_storage()) as buffer:
+        for article in crawl():
+            buffer.put(article)
+"""
+
+import asyncio
+import atexit
+import os
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable
+
+from atss.db_utils import logger
+
+
+def _get_ingest_config() -> Dict:
+    """获取写入缓冲配置"""
+    return {
+        "batch_size": int(os.getenv("DB_INGEST_BATCH_SIZE", "1000")),
+        "flush_interval": float(os.getenv("DB_INGEST_FLUSH_INTERVAL", "2")),
+        "max_pending": int(os.getenv("DB_INGEST_MAX_PENDING", "10000")),
+    }
+
+
+class _FlushRequest:
+    """队列中的标记：后台线程写完此前的文章后通知等待方"""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class WriteBehindBuffer:
+    """文章写入缓冲区，线程安全
+
+    Args:
+        storage: 提供 bulk_upsert_articles 的存储（ArticleStorage 或 SQLiteArticleStorage）
+        batch_size: 每批写入的文章数
+        flush_interval: 未攒满一批时，最早一篇文章最多等待的秒数
+        max_pending: 队列中最多等待写入的文章数，超过时 put() 阻塞
+    """
+
+    def __init__(self, storage, batch_size: int = None, flush_interval: float = None, max_pending: int = None):
+        config = _get_ingest_config()
+        self.storage = storage
+        self.batch_size = batch_size or config["batch_size"]
+        self.flush_interval = config["flush_interval"] if flush_interval is None else flush_interval
+        self._queue = queue.Queue(maxsize=max_pending or config["max_pending"])
+        self._lock = threading.Lock()
+        self._closed = False
+        # 已通过关闭检查、尚未放入队列的 put() 数量；close() 等它们入队后再放停止标记
+        self._putting = 0
+        self._puts_done = threading.Condition(self._lock)
+        # 最近若干批的写入耗时和文章从提交到写入完成的等待时间（秒）
+        self._flush_durations = deque(maxlen=1000)
+        self._article_latencies = deque(maxlen=1000)
+        self.stats = {
+            "enqueued": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "batches": 0,
+            "backpressure_waits": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name="ingest-buffer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, article: Dict, timeout: float = None):
+        """提交一篇文章；队列已满时阻塞等待（最多 timeout 秒，超时抛出 queue.Full）"""
+        self._begin_put()
+        item = (time.monotonic(), article)
+        try:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._lock:
+                    self.stats["backpressure_waits"] += 1
+                self._queue.put(item, timeout=timeout)
+        except BaseException:
+            self._end_put(enqueued=False)
+            raise
+        self._end_put(enqueued=True)
+
+    def put_many(self, articles: Iterable[Dict], timeout: float = None):
+        """逐篇提交多篇文章"""
+        for article in articles:
+            self.put(article, timeout=timeout)
+
+    async def put_async(self, article: Dict):
+        """在 asyncio 协程中提交文章，队列已满时在线程中等待而不阻塞事件循环"""
+        self._begin_put()
+        try:
+            self._queue.put_nowait((time.monotonic(), article))
+        except queue.Full:
+            self._end_put(enqueued=False)
+            await asyncio.to_thread(self.put, article)
+            return
+        self._end_put(enqueued=True)
+
+    def _begin_put(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("写入缓冲已关闭")
+            self._putting += 1
+
+    def _end_put(self, enqueued: bool):
+        with self._lock:
+            self._putting -= 1
+            if enqueued:
+                self.stats["enqueued"] += 1
+            self._puts_done.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """等待此前提交的文章全部写入，返回是否在 timeout 内完成"""
+        if self._closed:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = None):
+        """写完剩余文章并停止后台线程（可重复调用）"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # 与 close() 并发、已通过检查的 put() 先入队，保证它们排在停止标记之前
+            self._puts_done.wait_for(lambda: not self._putting, timeout)
+        request = _FlushRequest(stop=True)
+        self._queue.put(request)
+        request.done.wait(timeout)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._drain_after_stop()
+        atexit.unregister(self.close)
+
+    def _drain_after_stop(self):
+        """后台线程退出后仍留在队列中的文章（等待并发 put() 超时时才会出现）记为失败"""
+        left = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            else:
+                left += 1
+        if left:
+            logger.error(f"写入缓冲关闭后仍有 {left} 篇文章未写入")
+            with self._lock:
+                self.stats["failed"] += left
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        batch = []
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, batch[0][0] + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # 最早的文章已等待 flush_interval 秒
+                self._write(batch)
+                batch = []
+                continue
+
+            if isinstance(item, _FlushRequest):
+                self._write(batch)
+                batch = []
+                item.done.set()
+                if item.stop:
+                    return
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        if not batch:
+            return
+        started = time.monotonic()
+        try:
+            result = self.storage.bulk_upsert_articles([article for _, article in batch], chunk_size=self.batch_size)
+        except Exception as e:
+            logger.error(f"写入缓冲批量写入失败（{len(batch)} 篇）: {e}")
+            result = {"failed": len(batch)}
+        finished = time.monotonic()
+        with self._lock:
+            for key in ("inserted", "updated", "unchanged", "failed"):
+                self.stats[key] += result.get(key, 0)
+            self.stats["batches"] += 1
+            self._flush_durations.append(finished - started)
+            self._article_latencies.append(finished - batch[0][0])
+
+    def get_stats(self) -> Dict:
+        """写入统计；延迟单位为毫秒，基于最近 1000 批"""
+        with self._lock:
+            stats = dict(self.stats, pending=self._queue.qsize())
+            durations = sorted(self._flush_durations)
+            latencies = sorted(self._article_latencies)
+
+        def percentile(values, p):
+            return round(values[min(len(values) - 1, int(len(values) * p))] * 1000, 2) if values else None
+
+        stats.update(
+            flush_ms_avg=round(statistics.fmean(durations) * 1000, 2) if durations else None,
+            flush_ms_p95=percentile(durations, 0.95),
+            flush_ms_max=percentile(durations, 1.0),
+            # 一批中最早提交的文章从 put() 到写入完成的时间
+            latency_ms_p50=percentile(latencies, 0.5),
+            latency_ms_p95=percentile(latencies, 0.95),
+        )
+        return stats
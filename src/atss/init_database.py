@@ -44,56 +44,19 @@ def create_database():
         raise
 
 def create_tables():
-    """创建表结构"""
+    """创建表结构（执行所有未执行的数据库迁移）"""
+    from atss.db_utils import NewsDatabase
+    from atss.migrate import migrate
+
     try:
-        conn = psycopg2.connect(
-            host=os.getenv('DB_HOST', '127.0.0.1'),
-            database=os.getenv('DB_NAME', 'news_db'),
-            user=os.getenv('DB_USER', 'postgres'),
-            password=os.getenv('DB_PASSWORD', '740918'),
-            port=os.getenv('DB_PORT', '5432')
-        )
-        
-        cursor = conn.cursor()
-        
-        # 创建文章表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id SERIAL PRIMARY KEY,
-                title TEXT NOT NULL,
-                content TEXT,
-                url TEXT UNIQUE NOT NULL,
-                source VARCHAR(255),
-                published_date DATE,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        print("✓ 表 articles 创建成功")
-        
-        # 创建索引
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_articles_source 
-            ON articles(source)
-        """)
-        print("✓ 索引 idx_articles_source 创建成功")
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_articles_published_date 
-            ON articles(published_date)
-        """)
-        print("✓ 索引 idx_articles_published_date 创建成功")
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_articles_created_at 
-            ON articles(created_at)
-        """)
-        print("✓ 索引 idx_articles_created_at 创建成功")
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
+        conn = NewsDatabase.connect_unpooled()
+        try:
+            applied = migrate(conn)
+        finally:
+            conn.close()
+
+        if applied:
+            print(f"✓ 已执行迁移: {', '.join(str(v) for v in applied)}")
         print("\n✓ 所有表和索引创建完成")
         
     except Exception as e:
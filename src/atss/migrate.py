@@ -0,0 +1,184 @@
+"""
+数据库迁移
+功能：按版本顺序执行 src/atss/migrations/ 下的 SQL 迁移文件，并记录在 schema_version 表中
+
+迁移文件命名为 NNNN_description.sql，版本号严格递增。每个迁移在单独的事务中执行，
+已执行的版本不会重复执行。
+
+用法:
+  python -m atss.migrate            # 执行所有未执行的迁移，并预建未来几个月的分区
+  python -m atss.migrate --status   # 查看当前版本和待执行的迁移
+"""
+
+import argparse
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from atss import logger
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# 防止多个进程同时执行迁移的 advisory lock 键
+_MIGRATION_LOCK_ID = 548101
+
+_MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+def load_migrations() -> List[Tuple[int, str, str]]:
+    """读取所有迁移文件
+
+    Returns:
+        按版本排序的 (version, name, sql) 列表
+    """
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = _MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            logger.warning(f"忽略命名不规范的迁移文件: {path.name}")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path.read_text(encoding="utf-8")))
+    migrations.sort()
+    versions = [m[0] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("迁移文件版本号重复")
+    return migrations
+
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_current_version(conn) -> int:
+    """获取数据库当前的迁移版本（未迁移时为 0）"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            conn.rollback()
+            return 0
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        version = cursor.fetchone()[0]
+    conn.rollback()
+    return version
+
+
+def migrate(conn, target: int | None = None) -> List[int]:
+    """执行未执行的迁移
+
+    Args:
+        conn: psycopg2 连接（非 autocommit）
+        target: 迁移到的版本，默认迁移到最新
+
+    Returns:
+        本次执行的版本号列表
+    """
+    migrations = load_migrations()
+    applied = []
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (_MIGRATION_LOCK_ID,))
+        try:
+            _ensure_version_table(cursor)
+            cursor.execute("SELECT version FROM schema_version")
+            done = {row[0] for row in cursor.fetchall()}
+            conn.commit()
+
+            for version, name, sql in migrations:
+                if version in done or (target is not None and version > target):
+                    continue
+                logger.info(f"执行数据库迁移 {version:04d}_{name}")
+                try:
+                    cursor.execute(sql)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                        (version, name),
+                    )
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"✗ 数据库迁移 {version:04d}_{name} 失败: {e}")
+                    raise
+                applied.append(version)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (_MIGRATION_LOCK_ID,))
+            conn.commit()
+    return applied
+
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.year * 12 + d.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_window_end(months_ahead: int | None = None) -> date:
+    """自动建分区的截止月份（不含）：当前月份之后 months_ahead 个月
+
+    发布日期晚于该月份的文章视为异常日期，留在默认分区中。
+    """
+    if months_ahead is None:
+        months_ahead = int(os.getenv("DB_PARTITION_MONTHS_AHEAD", "3"))
+    return _add_months(date.today().replace(day=1), months_ahead + 1)
+
+
+def ensure_partitions(conn, months: Iterable[date]):
+    """确保 articles 在这些月份都有分区，每个分区在单独的短事务中创建
+
+    迁移 0006 之前的数据库没有分区，直接返回。
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regproc('ensure_articles_partition') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            conn.rollback()
+            return
+        for month in sorted(set(months)):
+            cursor.execute("SELECT ensure_articles_partition(%s)", (month,))
+            conn.commit()
+
+
+def ensure_future_partitions(conn, months_ahead: int | None = None):
+    """为当前月份及之后 months_ahead 个月预先创建分区"""
+    end = partition_window_end(months_ahead)
+    month = date.today().replace(day=1)
+    months = []
+    while month < end:
+        months.append(month)
+        month = _add_months(month, 1)
+    ensure_partitions(conn, months)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="执行数据库迁移")
+    parser.add_argument("--status", action="store_true", help="只显示当前版本和待执行的迁移")
+    parser.add_argument("--target", type=int, help="迁移到指定版本（默认最新）")
+    args = parser.parse_args()
+
+    from atss.db_utils import NewsDatabase
+
+    conn = NewsDatabase.connect_unpooled()
+    try:
+        current = get_current_version(conn)
+        pending = [m for m in load_migrations() if m[0] > current]
+        print(f"当前版本: {current}")
+        if args.status:
+            for version, name, _ in pending:
+                print(f"  待执行: {version:04d}_{name}")
+            return
+        applied = migrate(conn, target=args.target)
+        ensure_future_partitions(conn)
+        if applied:
+            print(f"✓ 已执行 {len(applied)} 个迁移，当前版本: {applied[-1]}")
+        else:
+            print("✓ 数据库已是最新版本")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+-- 初始表结构（与早期 ArticleStorage._create_tables 一致，已有数据库可直接采用）
+
+CREATE TABLE IF NOT EXISTS articles (
+    id SERIAL PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT,
+    url TEXT UNIQUE NOT NULL,
+    source VARCHAR(255),
+    published_date DATE,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+
+CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles(published_date);
+
+CREATE INDEX IF NOT EXISTS idx_articles_created_at ON articles(created_at);
+
+-- 在 title 和 content 上创建全文搜索索引
+CREATE INDEX IF NOT EXISTS idx_articles_fulltext ON articles USING GIN (
+    to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))
+);
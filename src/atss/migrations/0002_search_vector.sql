@@ -0,0 +1,11 @@
+-- 全文搜索：存储带权重的 tsvector（标题权重 A 高于正文权重 B），替代依赖表达式匹配的 idx_articles_fulltext
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_articles_search_vector ON articles USING GIN (search_vector);
+
+DROP INDEX IF EXISTS idx_articles_fulltext;
@@ -0,0 +1,16 @@
+-- 键集分页：每个可排序列建立 (列, id) 复合索引，替代原单列索引
+-- title 不建索引：抓取到的超长标题可能超过 btree 索引项的大小上限导致写入失败
+
+CREATE INDEX IF NOT EXISTS idx_articles_published_date_id ON articles(published_date, id);
+
+CREATE INDEX IF NOT EXISTS idx_articles_source_id ON articles(source, id);
+
+CREATE INDEX IF NOT EXISTS idx_articles_scraped_at_id ON articles(scraped_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_articles_created_at_id ON articles(created_at, id);
+
+DROP INDEX IF EXISTS idx_articles_published_date;
+
+DROP INDEX IF EXISTS idx_articles_source;
+
+DROP INDEX IF EXISTS idx_articles_created_at;
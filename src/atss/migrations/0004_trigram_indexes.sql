@@ -0,0 +1,15 @@
+-- 模糊搜索：为 ILIKE '%q%' 建立 pg_trgm 三元组 GIN 索引
+-- 服务器未安装 pg_trgm（postgresql-contrib）时跳过，安装后可手动执行本文件中的语句
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_articles_title_trgm ON articles USING GIN (title gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_articles_content_trgm ON articles USING GIN (content gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_articles_source_trgm ON articles USING GIN (source gin_trgm_ops);
+    ELSE
+        RAISE WARNING 'pg_trgm extension is not available, skipping trigram indexes';
+    END IF;
+END
+$$;
@@ -0,0 +1,8 @@
+-- 列表页摘要：存储正文前 250 个字符和正文长度，列表查询无需读取正文
+-- 生成列在写入时自动计算，添加列时会为已有文章回填
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS snippet TEXT
+    GENERATED ALWAYS AS (left(content, 250)) STORED;
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS content_length INTEGER
+    GENERATED ALWAYS AS (char_length(content)) STORED;
@@ -0,0 +1,126 @@
+-- 按 published_date 对 articles 按月做范围分区
+-- 发布日期为空（或超出已建分区范围）的文章进入默认分区 articles_default。
+-- 分区表上的唯一约束必须包含分区键，URL 唯一性改由 article_urls 查找表保证，
+-- 其中同时记录文章 id 和所在分区的 published_date。
+
+ALTER TABLE articles RENAME TO articles_unpartitioned;
+
+-- 索引名需要留给新表使用
+DROP INDEX IF EXISTS idx_articles_search_vector;
+DROP INDEX IF EXISTS idx_articles_published_date_id;
+DROP INDEX IF EXISTS idx_articles_source_id;
+DROP INDEX IF EXISTS idx_articles_scraped_at_id;
+DROP INDEX IF EXISTS idx_articles_created_at_id;
+DROP INDEX IF EXISTS idx_articles_title_trgm;
+DROP INDEX IF EXISTS idx_articles_content_trgm;
+DROP INDEX IF EXISTS idx_articles_source_trgm;
+
+-- 新表继续使用原有的 id 序列
+ALTER SEQUENCE articles_id_seq OWNED BY NONE;
+
+CREATE TABLE articles (
+    id INTEGER NOT NULL DEFAULT nextval('articles_id_seq'),
+    title TEXT NOT NULL,
+    content TEXT,
+    url TEXT NOT NULL,
+    source VARCHAR(255),
+    published_date DATE,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED,
+    snippet TEXT GENERATED ALWAYS AS (left(content, 250)) STORED,
+    content_length INTEGER GENERATED ALWAYS AS (char_length(content)) STORED
+) PARTITION BY RANGE (published_date);
+
+ALTER SEQUENCE articles_id_seq OWNED BY articles.id;
+
+CREATE TABLE articles_default PARTITION OF articles DEFAULT;
+
+CREATE TABLE article_urls (
+    url TEXT PRIMARY KEY,
+    article_id INTEGER NOT NULL UNIQUE,
+    published_date DATE
+);
+
+-- 创建 d 所在月份的分区（已存在时不做任何事）；默认分区中该月份的文章会被移入新分区。
+-- 移动的列取自系统目录（跳过生成列），之后给 articles 增加列时不需要重新定义本函数。
+CREATE OR REPLACE FUNCTION ensure_articles_partition(d DATE) RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', d)::date;
+    month_end DATE := (date_trunc('month', d) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'articles_p' || to_char(d, 'YYYY_MM');
+    move_columns TEXT;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    -- 串行化并发的分区创建
+    PERFORM pg_advisory_xact_lock(548102);
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM articles_default
+               WHERE published_date >= month_start AND published_date < month_end) THEN
+        SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO move_columns
+        FROM pg_attribute
+        WHERE attrelid = 'articles'::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+        CREATE TEMP TABLE articles_partition_move AS
+            SELECT * FROM articles_default
+            WHERE published_date >= month_start AND published_date < month_end;
+        -- 该月份尚无分区，父表上的删除只会落在默认分区；经由父表删除和插入，父表上的触发器能看到这次移动
+        DELETE FROM articles
+            WHERE published_date >= month_start AND published_date < month_end;
+        EXECUTE format('CREATE TABLE %I PARTITION OF articles FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, month_start, month_end);
+        EXECUTE format('INSERT INTO articles (%s) SELECT %s FROM articles_partition_move', move_columns, move_columns);
+        DROP TABLE articles_partition_move;
+    ELSE
+        EXECUTE format('CREATE TABLE %I PARTITION OF articles FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, month_start, month_end);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 为已有数据的月份建分区（未来月份之外的异常日期留在默认分区）
+SELECT ensure_articles_partition(month)
+FROM (
+    SELECT DISTINCT date_trunc('month', published_date)::date AS month
+    FROM articles_unpartitioned
+    WHERE published_date < date_trunc('month', CURRENT_DATE) + INTERVAL '4 months'
+) months;
+
+INSERT INTO articles (id, title, content, url, source, published_date, scraped_at, created_at)
+    SELECT id, title, content, url, source, published_date, scraped_at, created_at
+    FROM articles_unpartitioned;
+
+INSERT INTO article_urls (url, article_id, published_date)
+    SELECT url, id, published_date FROM articles_unpartitioned;
+
+DROP TABLE articles_unpartitioned;
+
+-- 在父表上建索引，各分区（包括之后新建的分区）自动继承
+CREATE INDEX idx_articles_id ON articles(id);
+
+CREATE INDEX idx_articles_search_vector ON articles USING GIN (search_vector);
+
+CREATE INDEX idx_articles_published_date_id ON articles(published_date, id);
+
+CREATE INDEX idx_articles_source_id ON articles(source, id);
+
+CREATE INDEX idx_articles_scraped_at_id ON articles(scraped_at, id);
+
+CREATE INDEX idx_articles_created_at_id ON articles(created_at, id);
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX idx_articles_title_trgm ON articles USING GIN (title gin_trgm_ops);
+        CREATE INDEX idx_articles_content_trgm ON articles USING GIN (content gin_trgm_ops);
+        CREATE INDEX idx_articles_source_trgm ON articles USING GIN (source gin_trgm_ops);
+    END IF;
+END
+$$;
@@ -0,0 +1,14 @@
+-- 文章内容哈希：重复写入未变化的文章时只比较 article_urls 中的哈希，不读取也不改写 articles 的行
+-- 哈希为 md5(title, content, source, published_date 以 0x1f 分隔)，与 db_utils._content_hash 一致。
+
+ALTER TABLE articles ADD COLUMN content_hash TEXT;
+ALTER TABLE article_urls ADD COLUMN content_hash TEXT;
+
+UPDATE articles SET content_hash = md5(
+    title || chr(31) || coalesce(content, '') || chr(31) || coalesce(source, '') || chr(31) ||
+    coalesce(to_char(published_date, 'YYYY-MM-DD'), '')
+);
+
+UPDATE article_urls u SET content_hash = a.content_hash
+FROM articles a
+WHERE a.id = u.article_id AND a.published_date IS NOT DISTINCT FROM u.published_date;
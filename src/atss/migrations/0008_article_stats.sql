@@ -0,0 +1,85 @@
+-- 按 (来源, 发布日期) 增量维护的文章数量汇总，供来源列表和分面统计使用，无需扫描 articles。
+-- 由 articles 上的语句级触发器（转换表）维护：每条 INSERT/UPDATE/DELETE 语句按 (来源, 日期)
+-- 聚合后只更新一次汇总行，批量写入时开销与写入的不同日期数成正比。
+
+CREATE TABLE article_stats (
+    source VARCHAR(255),
+    day DATE,
+    article_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- 来源或日期为空的文章同样计入，唯一索引把 NULL 视为同一个值
+CREATE UNIQUE INDEX idx_article_stats_key
+    ON article_stats ((coalesce(source, '')), (coalesce(day, '-infinity'::date)));
+
+CREATE INDEX idx_article_stats_day ON article_stats(day);
+
+-- 各触发器把本条语句涉及的行按 (source, day) 聚合后累加到汇总表；按键排序以免并发写入时死锁
+CREATE OR REPLACE FUNCTION article_stats_on_insert() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO article_stats (source, day, article_count)
+    SELECT source, published_date, count(*)
+    FROM new_rows
+    GROUP BY source, published_date
+    ORDER BY coalesce(source, ''), coalesce(published_date, '-infinity'::date)
+    ON CONFLICT ((coalesce(source, '')), (coalesce(day, '-infinity'::date)))
+    DO UPDATE SET article_count = article_stats.article_count + excluded.article_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION article_stats_on_delete() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO article_stats (source, day, article_count)
+    SELECT source, published_date, -count(*)
+    FROM old_rows
+    GROUP BY source, published_date
+    ORDER BY coalesce(source, ''), coalesce(published_date, '-infinity'::date)
+    ON CONFLICT ((coalesce(source, '')), (coalesce(day, '-infinity'::date)))
+    DO UPDATE SET article_count = article_stats.article_count + excluded.article_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 只有来源或发布日期变化的行会改变汇总，内容更新不产生任何写入
+CREATE OR REPLACE FUNCTION article_stats_on_update() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO article_stats (source, day, article_count)
+    SELECT source, day, sum(delta)
+    FROM (
+        SELECT source, published_date AS day, 1 AS delta FROM new_rows
+        UNION ALL
+        SELECT source, published_date AS day, -1 AS delta FROM old_rows
+    ) changes
+    GROUP BY source, day
+    HAVING sum(delta) <> 0
+    ORDER BY coalesce(source, ''), coalesce(day, '-infinity'::date)
+    ON CONFLICT ((coalesce(source, '')), (coalesce(day, '-infinity'::date)))
+    DO UPDATE SET article_count = article_stats.article_count + excluded.article_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_article_stats_insert AFTER INSERT ON articles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION article_stats_on_insert();
+
+CREATE TRIGGER trg_article_stats_delete AFTER DELETE ON articles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION article_stats_on_delete();
+
+CREATE TRIGGER trg_article_stats_update AFTER UPDATE ON articles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION article_stats_on_update();
+
+-- 直接删除/清空分区不会触发父表上的语句级触发器，之后调用它重新计算汇总
+CREATE OR REPLACE FUNCTION rebuild_article_stats() RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE article_stats IN EXCLUSIVE MODE;
+    DELETE FROM article_stats;
+    INSERT INTO article_stats (source, day, article_count)
+    SELECT source, published_date, count(*) FROM articles GROUP BY source, published_date;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_article_stats();
@@ -0,0 +1,9 @@
+-- 入库时清洗：保存清洗后的标题和正文、验证结果以及清洗规则版本（data_cleaner.CLEANER_VERSION），
+-- 管道对版本为当前值的文章直接使用保存的结果，不再重复清洗。
+-- 清洗在 Python 中完成，已有文章由回填任务生成：python -m atss.clean_backfill
+
+ALTER TABLE articles
+    ADD COLUMN cleaned_title TEXT,
+    ADD COLUMN cleaned_content TEXT,
+    ADD COLUMN is_valid BOOLEAN,
+    ADD COLUMN cleaner_version INTEGER;
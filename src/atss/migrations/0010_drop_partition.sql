@@ -0,0 +1,25 @@
+-- 按月清理历史数据：删除整个分区，同时删除该月份在 article_urls 中的 URL 并重新计算汇总。
+-- 直接 DROP TABLE 分区会在 article_urls 中留下这些 URL，之后再次写入同一 URL 时会被当作已存在的文章而丢失。
+
+-- 删除 d 所在月份的分区（不存在时不做任何事），返回删除的 URL 数
+CREATE OR REPLACE FUNCTION drop_articles_partition(d DATE) RETURNS BIGINT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', d)::date;
+    month_end DATE := (date_trunc('month', d) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'articles_p' || to_char(d, 'YYYY_MM');
+    removed BIGINT;
+BEGIN
+    -- 与 ensure_articles_partition 串行化
+    PERFORM pg_advisory_xact_lock(548102);
+    IF to_regclass(partition_name) IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    EXECUTE format('DROP TABLE %I', partition_name);
+    DELETE FROM article_urls
+        WHERE published_date >= month_start AND published_date < month_end;
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    PERFORM rebuild_article_stats();
+    RETURN removed;
+END;
+$$ LANGUAGE plpgsql;
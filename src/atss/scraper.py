@@ -17,7 +17,8 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
-from atss.db_utils import ArticleStorage
+from atss.db_utils import get_article_storage
+from atss.ingest_buffer import WriteBehindBuffer
 
 # 加载环境变量
 load_dotenv()
@@ -44,14 +45,20 @@ class MyNewsScraper:
         # 初始化数据库管理器
         if self.use_database:
             try:
-                self.article_storage = ArticleStorage()
+                self.article_storage = get_article_storage()
+                # 抓取过程中把文章交给写入缓冲，后台写库与抓取下一个源并行
+                self.ingest_buffer = WriteBehindBuffer(self.article_storage)
                 logger.info("数据库管理器初始化成功")
             except Exception as e:
                 logger.warning(f"数据库初始化失败，将只保存到文件: {e}")
                 self.use_database = False
                 self.article_storage = None
+                self.ingest_buffer = None
         else:
             self.article_storage = None
+            self.ingest_buffer = None
+        # 已提交到写入缓冲的文章 URL，避免保存时重复提交
+        self._queued_urls = set()
     
     def _scrape_generic_news(self, url: str, source_name: str) -> List[Dict]:
         """通用新闻抓取方法"""
@@ -188,6 +195,7 @@ class MyNewsScraper:
             articles = self._scrape_generic_news(source['url'], source['name'])
             all_articles.extend(articles)
             logger.info(f"从 {source['name']} 抓取了 {len(articles)} 篇文章")
+            self._enqueue(articles)
             
             # 源之间的延迟
             time.sleep(3)
@@ -203,13 +211,28 @@ class MyNewsScraper:
         
         logger.info(f"数据已保存到 {output_path}，共 {len(articles)} 篇文章")
     
+    def _enqueue(self, articles: List[Dict]):
+        """把尚未提交的文章交给写入缓冲"""
+        if not self.ingest_buffer:
+            return
+        for article in articles:
+            if article.get('url') in self._queued_urls:
+                continue
+            self._queued_urls.add(article.get('url'))
+            self.ingest_buffer.put(article)
+    
     def _save_to_database(self, articles: List[Dict]) -> int:
-        """保存抓取的数据到数据库"""
+        """保存抓取的数据到数据库（等待写入缓冲中的文章全部写入）"""
         if not self.use_database or not self.article_storage:
             logger.warning("数据库未启用，跳过数据库保存")
             return 0
         
-        return self.article_storage.save_articles(articles)
+        failed_before = self.ingest_buffer.get_stats()['failed']
+        self._enqueue(articles)
+        self.ingest_buffer.flush()
+        stats = self.ingest_buffer.get_stats()
+        logger.info(f"写入缓冲统计: {stats}")
+        return len(articles) - (stats['failed'] - failed_before)
     
     def save_articles(self, articles: List[Dict]):
         """保存文章（同时保存到文件和数据库）"""
@@ -223,6 +246,8 @@ class MyNewsScraper:
     
     def close(self):
         """关闭资源"""
+        if self.ingest_buffer:
+            self.ingest_buffer.close()
         if self.article_storage:
             self.article_storage.close()
 
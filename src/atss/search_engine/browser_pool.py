@@ -0,0 +1,155 @@
+"""This module implements a pool of reusable headless Chrome instances for the web search engines.
+
+Starting Chrome is the most expensive part of a web search, so instances are started lazily, shared
+by all WebScraperSearchEngine objects in the process and recycled after a number of uses to bound
+memory growth. Images, fonts and media are blocked since only the DOM is needed.
+
+The pool is configured by the ``search_engine.browser_pool`` section of config/config.json.
+"""
+
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+from atss import logger
+
+# URL patterns blocked through the DevTools protocol, on top of the image content setting
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8", "*.ogg",
+]
+
+
+class _PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        max_size: int = 2,
+        max_uses: int = 50,
+        headless: bool = True,
+        page_load_timeout: float = 30,
+    ):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.page_load_timeout = page_load_timeout
+
+        self._idle: queue.LifoQueue[_PooledBrowser] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._all: set[_PooledBrowser] = set()
+        self._closed = False
+
+    def _start_browser(self) -> _PooledBrowser:
+        from selenium.webdriver import Chrome, ChromeOptions
+
+        chrome_options = ChromeOptions()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        # return from driver.get() once the DOM is ready; callers wait for their own selector
+        chrome_options.page_load_strategy = "eager"
+
+        driver = Chrome(options=chrome_options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.warning(f"Failed to block resources in browser: {e}")
+
+        browser = _PooledBrowser(driver)
+        with self._lock:
+            self._all.add(browser)
+        logger.info(f"Started headless browser ({len(self._all)}/{self.max_size})")
+        return browser
+
+    def _quit_browser(self, browser: _PooledBrowser):
+        with self._lock:
+            self._all.discard(browser)
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit browser: {e}")
+
+    @contextmanager
+    def browser(self):
+        """Check out a browser for exclusive use, e.g. ``with pool.browser() as driver: ...``.
+
+        Blocks while ``max_size`` browsers are checked out. A browser whose use raised an exception
+        is discarded instead of being returned to the pool.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down")
+
+        self._slots.acquire()
+        browser = None
+        try:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                browser = self._start_browser()
+
+            yield browser.driver
+
+            browser.uses += 1
+            if self._closed or browser.uses >= self.max_uses:
+                logger.info(f"Recycling browser after {browser.uses} uses")
+                self._quit_browser(browser)
+            else:
+                self._idle.put(browser)
+        except BaseException:
+            if browser is not None:
+                self._quit_browser(browser)
+            raise
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        """Quit all idle browsers. Browsers in use are quit when they are returned."""
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit_browser(browser)
+
+
+_browser_pool: BrowserPool | None = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it from config/config.json on first use."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            try:
+                from atss.config import get_config
+
+                config = get_config().get("search_engine", {}).get("browser_pool", {})
+            except Exception as e:
+                logger.warning(f"Failed to load browser pool config, using defaults: {e}")
+                config = {}
+            _browser_pool = BrowserPool(
+                max_size=config.get("max_size", 2),
+                max_uses=config.get("max_uses", 50),
+                headless=config.get("headless", True),
+                page_load_timeout=config.get("page_load_timeout", 30),
+            )
+            atexit.register(_browser_pool.shutdown)
+        return _browser_pool
@@ -0,0 +1,179 @@
+"""This module implements a query-result cache shared by the search engines.
+
+Results are keyed on (engine, normalized query, page), where page is a page number or a result page
+URL, and stored as JSON files under the cache directory, so repeated topic searches and pipeline
+re-runs in separate processes can reuse them.
+
+Entries younger than ``ttl`` seconds are served as-is. Entries older than ``ttl`` but younger than
+``ttl + stale_ttl`` are served immediately while a background thread refreshes them
+(stale-while-revalidate). Older entries are fetched again in the foreground.
+
+The cache is configured by the ``search_cache`` section of config/config.json.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable
+
+from atss import logger
+from atss.path_config import PROJECT_ROOT, TEMP_DIR
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different spellings share a cache entry."""
+    query = unicodedata.normalize("NFKC", query)
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _is_empty(value: Any) -> bool:
+    """Whether a fetched value holds no results; result pages are dicts with a ``records`` list."""
+    if isinstance(value, dict) and "records" in value:
+        return not value["records"]
+    return not value
+
+
+class SearchCache:
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl: float = 3600,
+        stale_ttl: float = 86400,
+        enabled: bool = True,
+    ):
+        cache_dir = Path(cache_dir) if cache_dir else TEMP_DIR / "search_cache"
+        if not cache_dir.is_absolute():
+            cache_dir = PROJECT_ROOT / cache_dir
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+
+    def _key(self, engine: str, query: str, page: int | str) -> str:
+        raw = json.dumps([engine, normalize_query(query), page], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load(self, key: str) -> dict | None:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read search cache entry {key}: {e}")
+            return None
+
+    def _store(self, key: str, engine: str, query: str, page: int | str, value: Any):
+        path = self._path(key)
+        entry = {
+            "engine": engine,
+            "query": normalize_query(query),
+            "page": page,
+            "fetched_at": time.time(),
+            "value": value,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write search cache entry {key}: {e}")
+
+    def _fetch_and_store(self, key, engine, query, page, fetch):
+        value = fetch()
+        # empty results are usually a transient block or a layout change, so they are not cached
+        if not _is_empty(value):
+            self._store(key, engine, query, page, value)
+        return value
+
+    def _refresh_in_background(self, key, engine, query, page, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._fetch_and_store(key, engine, query, page, fetch)
+                logger.debug(f"Refreshed search cache for {engine} '{query}' page {page}")
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {engine} '{query}' page {page}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # not a daemon thread, so a CLI run still persists the refreshed entry before exiting
+        threading.Thread(target=run, name=f"search-cache-refresh-{key[:8]}").start()
+
+    def get_or_fetch(self, engine: str, query: str, page: int | str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached result for (engine, query, page), calling ``fetch`` when needed.
+
+        ``fetch`` must return a JSON-serializable value. Exceptions raised by ``fetch`` in the
+        foreground propagate to the caller and nothing is cached.
+        """
+        if not self.enabled:
+            return fetch()
+
+        key = self._key(engine, query, page)
+        entry = self._load(key)
+        if entry is not None:
+            age = time.time() - entry.get("fetched_at", 0)
+            if age < self.ttl:
+                logger.info(f"Search cache hit: {engine} '{query}' page {page}")
+                return entry["value"]
+            if age < self.ttl + self.stale_ttl:
+                logger.info(f"Search cache stale hit: {engine} '{query}' page {page}, refreshing")
+                self._refresh_in_background(key, engine, query, page, fetch)
+                return entry["value"]
+
+        return self._fetch_and_store(key, engine, query, page, fetch)
+
+    def invalidate(self, engine: str, query: str, page: int | str):
+        try:
+            self._path(self._key(engine, query, page)).unlink()
+        except FileNotFoundError:
+            pass
+
+
+_search_cache: SearchCache | None = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache(config: dict | None = None) -> SearchCache:
+    """Return the process-wide search cache.
+
+    Args:
+        config: the ``search_cache`` config section; read from config/config.json when omitted.
+            Only used by the first call, which creates the shared instance.
+    """
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            if config is None:
+                try:
+                    from atss.config import get_config
+
+                    config = get_config().get("search_cache", {})
+                except Exception as e:
+                    logger.warning(f"Failed to load search cache config, using defaults: {e}")
+                    config = {}
+            _search_cache = SearchCache(
+                cache_dir=config.get("dir"),
+                ttl=config.get("ttl", 3600),
+                stale_ttl=config.get("stale_ttl", 86400),
+                enabled=config.get("enabled", True),
+            )
+        return _search_cache
@@ -1,4 +1,4 @@
-from atss.db_utils import ArticleStorage
+from atss.db_utils import get_article_storage
 from atss.news_source import NewsSource, News
 from datetime import datetime
 
@@ -16,7 +16,7 @@ def article_to_news(article: dict) -> News:
 class FTSSearchEngine(SearchEngine):
 
     def __init__(self):
-        self._storage = ArticleStorage()
+        self._storage = get_article_storage()
 
     def search(self, query: str):
         articles = self._storage.search_article(query)
@@ -11,24 +11,43 @@ text in the sitemap's start URL with {query} to make this module function.
 """
 
 import datetime
-from re import S
-from typing import Iterable
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Iterable, Iterator
+from urllib.parse import quote, urljoin
 
 import dateparser
-from regex import F
 import selenium
 
 from atss.news_source import News
 from . import SearchEngine
+from .browser_pool import get_browser_pool
+from .cache import get_search_cache
+import functools
 import json
+import os
+import threading
+import time
+from pathlib import Path
 
 
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, Tag
 
 from atss import logger
+from atss.http_client import get_http_client
+from atss.path_config import TEMP_DIR
 
 
 class Parser:
+    """A node of the extraction plan compiled from a sitemap.
+
+    Selectors are compiled once with soupsieve. Parsing builds a single lxml-backed tree and each
+    child parser is applied directly to the matched element, so no HTML is re-serialized or
+    re-parsed below the root.
+    """
+
     def __init__(
         self,
         id,
@@ -43,131 +62,425 @@ class Parser:
         self.children: list[Parser] = []
         self.parent = parent
         self.multiple = multiple
+        self._pattern = soupsieve.compile(selector) if selector else None
         parent.add_child(self) if parent else None
 
     def add_child(self, child_parser):
         self.children.append(child_parser)
 
     def parse(self, html: str):
-        soup = BeautifulSoup(html, "html.parser")
-        elements = soup.select(self.selector)
+        soup = BeautifulSoup(html, "lxml")
+        return self.extract(soup)
+
+    def extract(self, element: Tag):
+        """Apply this parser to an already parsed element."""
+        if self._pattern is None:
+            elements = [element]
+        elif self.multiple:
+            elements = self._pattern.select(element)
+        else:
+            # only the first match is used for single-valued selectors
+            first = self._pattern.select_one(element)
+            elements = [first] if first is not None else []
 
         if self.children:
-            results = []
-            for element in elements:
-                result = {}
-                for child in self.children:
-                    child_result = {child.id: child.parse(str(element))}
-                    result.update(child_result)
-                results.append(result)
+            results = [
+                {child.id: child.extract(e) for child in self.children}
+                for e in elements
+            ]
+        elif self.type_ == "SelectorLink":
+            results = [e.get("href") for e in elements]
         else:
-            if self.type_ == "SelectorText":
-                results = [e.get_text(strip=True) for e in elements]
-            elif self.type_ == "SelectorLink":
-                results = [e.get("href") for e in elements]
-            else:
-                results = [e.get_text(strip=True) for e in elements]
+            results = [e.get_text(strip=True) for e in elements]
         return results if self.multiple else results[0] if results else None
 
 
+def _compile_sitemap(sitemap: dict, root_id: str = "record_wrapper") -> Parser:
+    """Build the parser tree for a sitemap and return the parser of the records selector."""
+    parsers: dict[str, Parser] = {}
+    parsers["_root"] = Parser("_root", "", type_="Root")
+    # sitemap selectors are listed parent first; pagination selectors are handled by the engine
+    for s in sitemap["selectors"]:
+        if s["type"] == "SelectorPagination":
+            continue
+        parsers[s["id"]] = Parser(
+            s["id"],
+            s["selector"],
+            type_=s["type"],
+            multiple=s["multiple"],
+            parent=parsers[s["parentSelectors"][0]],
+        )
+    return parsers[root_id]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_sitemap_cached(sitemap_path: str, mtime: float) -> tuple[dict, Parser]:
+    with open(sitemap_path, "r", encoding="utf-8") as f:
+        sitemap = json.load(f)
+    return sitemap, _compile_sitemap(sitemap)
+
+
+def load_sitemap(sitemap_path) -> tuple[dict, Parser]:
+    """Load a sitemap and its compiled extraction plan.
+
+    Compiled plans are cached per sitemap file and recompiled when the file changes. The returned
+    objects are shared, so callers must not modify them.
+    """
+    sitemap_path = os.path.abspath(sitemap_path)
+    return _load_sitemap_cached(sitemap_path, os.path.getmtime(sitemap_path))
+
+
+_RANGE_PATTERN = re.compile(r"\[(\d+)-(\d+)(?::(\d+))?\]")
+
+
+def expand_start_url(start_url: str) -> list[str]:
+    """Expand a Web Scraper range such as ``[0-90:10]`` or ``[001-100]`` into page URLs.
+
+    Only the first range in the URL is expanded. URLs without a range are returned as is.
+    """
+    match = _RANGE_PATTERN.search(start_url)
+    if not match:
+        return [start_url]
+    first, last, step = match.group(1), match.group(2), int(match.group(3) or 1)
+    width = len(first) if first.startswith("0") and len(first) > 1 else 0
+    return [
+        start_url[: match.start()] + str(n).zfill(width) + start_url[match.end():]
+        for n in range(int(first), int(last) + 1, step)
+    ]
+
+
+class _RenderModeStore:
+    """Remembers per sitemap whether result pages need a browser ("browser") or not ("http").
+
+    The modes are persisted to a JSON file so that they survive across runs. A remembered mode
+    expires after ``reprobe_after`` seconds and is probed again, in case the site changed (moved
+    to client-side rendering, added a consent wall, or stopped needing a browser).
+    """
+
+    def __init__(self, path: Path, reprobe_after: float = 7 * 86400):
+        self.path = path
+        self.reprobe_after = reprobe_after
+        self._lock = threading.Lock()
+        self._modes: dict[str, dict] | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._modes is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._modes = json.load(f)
+            except FileNotFoundError:
+                self._modes = {}
+            except Exception as e:
+                logger.warning(f"Failed to read render modes from {self.path}: {e}")
+                self._modes = {}
+        return self._modes
+
+    def get(self, sitemap_id: str) -> str | None:
+        with self._lock:
+            entry = self._load().get(sitemap_id)
+        if not entry:
+            return None
+        if time.time() - entry["checked_at"] > self.reprobe_after:
+            return None
+        return entry["mode"]
+
+    def set(self, sitemap_id: str, mode: str):
+        with self._lock:
+            modes = self._load()
+            modes[sitemap_id] = {"mode": mode, "checked_at": time.time()}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(modes, f, indent=2)
+            except Exception as e:
+                logger.warning(f"Failed to save render modes to {self.path}: {e}")
+        logger.info(f"Render mode for {sitemap_id}: {mode}")
+
+
+_render_modes = _RenderModeStore(TEMP_DIR / "webscraper_render_modes.json")
+
+
 class WebScraperSearchEngine(SearchEngine):
-    def __init__(self, sitemap_path, limit: int = 10, go_detail=False):
+    def __init__(
+        self,
+        sitemap_path,
+        limit: int = 10,
+        go_detail=False,
+        wait_timeout: float = 10,
+        detail_workers: int = 4,
+        ordered: bool = True,
+        page_workers: int = 3,
+        max_pages: int = 20,
+    ):
+        """
+        Args:
+            go_detail: fetch the article page for records without content
+            detail_workers: number of article pages fetched concurrently when go_detail is set
+            ordered: yield records in listing order (the default), so a record waiting for its detail
+                page holds back the records after it; set to False to yield each record as soon as it
+                is ready
+            page_workers: number of result pages fetched concurrently
+            max_pages: upper bound on result pages fetched per query
+        """
         self.limit = limit
         self.go_detail = go_detail
-        # load site map
-        with open(sitemap_path, "r", encoding="utf-8") as f:
-            self._sitemap = json.load(f)
-
-        from selenium.webdriver import ChromeOptions, Chrome
-        chrome_options = ChromeOptions()
-        # chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver = Chrome(options=chrome_options)
-
-        self._init_parser()
-
-    def _init_parser(self):
-        parsers: dict[str, Parser] = {}
-        parsers["_root"] = Parser("_root", "", type_="Root")
-        # build parser tree with self.sitemap
-        for s in self._sitemap["selectors"]:
-            # print(s)
-            # print(type(s))
-            id = s["id"]
-            selector_ = s["selector"]
-            parent = parsers[s["parentSelectors"][0]]
-            multiple = s["multiple"]
-            type_ = s["type"]
-            parsers[id] = Parser(
-                id, selector_, type_=type_, multiple=multiple, parent=parent
-            )  # find parent parser
-
-        # search for the root selector (i.e., the one)
-        self.root_parser = parsers["record_wrapper"]
-
+        self.detail_workers = detail_workers
+        self.ordered = ordered
+        self.page_workers = page_workers
+        self.max_pages = max_pages
+        self.wait_timeout = wait_timeout
+        # load site map and its compiled extraction plan
+        self._sitemap, self.root_parser = load_sitemap(sitemap_path)
+        self._pagination = [
+            soupsieve.compile(s["selector"])
+            for s in self._sitemap["selectors"]
+            if s["type"] == "SelectorPagination"
+        ]
+        # browsers are started lazily and shared through the process-wide pool
+        self._browser_pool = get_browser_pool()
 
     def _get_page_source(self, url: str):
-        self.driver.get(url)
-        import time
-
-        time.sleep(2)  # wait for page to load
-        return self.driver.page_source
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self._browser_pool.browser() as driver:
+            driver.get(url)
+            # wait for the records to render instead of sleeping a fixed time
+            try:
+                WebDriverWait(driver, self.wait_timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.root_parser.selector))
+                )
+            except TimeoutException:
+                logger.warning(f"Timed out waiting for '{self.root_parser.selector}' on {url}")
+            return driver.page_source
+
+    def _parse_page(self, html: str, url: str) -> dict:
+        soup = BeautifulSoup(html, "lxml")
+        next_urls = []
+        for pattern in self._pagination:
+            for element in pattern.select(soup):
+                href = element.get("href")
+                if href:
+                    next_urls.append(urljoin(url, href))
+        return {"records": self.root_parser.extract(soup) or [], "next_urls": next_urls}
+
+    def _fetch_page_http(self, url: str) -> dict:
+        response = get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        return self._parse_page(response.text, url)
+
+    def _fetch_page(self, url: str) -> dict:
+        """Fetch and parse a result page, trying a plain HTTP GET before the browser.
+
+        Whether the site needs a browser is learned per sitemap and remembered until it expires
+        (see ``_RenderModeStore``). While a site is learned as "http", it only falls back to the
+        browser when the HTTP request fails, since an empty page there is a genuine empty page (past
+        the last result, or no results). Sites learned as "browser" go straight to the browser.
+
+        Returns:
+            a dict with the parsed ``records`` and the ``next_urls`` found by pagination selectors
+        """
+        sitemap_id = self._sitemap["_id"]
+        mode = _render_modes.get(sitemap_id)
+        if mode != "browser":
+            try:
+                page = self._fetch_page_http(url)
+            except Exception as e:
+                logger.warning(f"HTTP fetch failed for {url}, falling back to browser: {e}")
+            else:
+                if page["records"]:
+                    if mode is None:
+                        _render_modes.set(sitemap_id, "http")
+                    return page
+                if mode == "http":
+                    return page
+                logger.info(f"No records over HTTP for {sitemap_id}, falling back to browser")
+
+        page = self._parse_page(self._get_page_source(url), url)
+        if page["records"] and mode is None:
+            _render_modes.set(sitemap_id, "browser")
+        return page
+
+    def _crawl(self, query: str, page_urls: list[str]) -> Iterator[News]:
+        """Fetch result pages concurrently and yield up to ``limit`` unique news.
+
+        Records that cannot be converted to news (no publish date) are dropped before they count
+        towards the limit.
+
+        Pages are taken from the expanded start URLs first, then from links found by pagination
+        selectors. Scheduling stops at the first page that yields no new records (including a page
+        identical to an earlier one), and pages after it are cancelled or ignored. A page's records
+        are yielded as soon as it and every page before it have completed, so records come out in
+        listing order while later pages are still being fetched.
+        """
+        cache = get_search_cache()
+        # page entries hold records and pagination links, unlike the single-page records list
+        cache_engine = f"{self._sitemap['_id']}:pages"
+        queued = list(dict.fromkeys(page_urls))
+        queued_set = set(queued)
+        page_records: dict[int, list[News]] = {}  # completed pages that are not yielded yet
+        seen_record_urls = set()
+        seen_pages = set()
+        collected = 0
+        yielded = 0
+        next_yield = 0
+        stop_index = self.max_pages  # pages at or after this index are not used
+        next_index = 0
+
+        def fetch(index):
+            # keyed on the page URL: pagination links are queued in completion order, so the same
+            # index can refer to a different page on another run
+            url = queued[index]
+            return cache.get_or_fetch(cache_engine, query, url, lambda: self._fetch_page(url))
+
+        def needed(index):
+            # a pending page is still needed if the pages before it cannot fill the limit
+            if index >= stop_index:
+                return False
+            before = yielded + sum(len(page_records[i]) for i in page_records if i < index)
+            return before < self.limit
+
+        executor = ThreadPoolExecutor(max_workers=self.page_workers)
+        pending = {}
+        try:
+            while True:
+                while (
+                    next_index < len(queued)
+                    and next_index < stop_index
+                    and len(pending) < self.page_workers
+                    and collected < self.limit
+                ):
+                    pending[executor.submit(fetch, next_index)] = next_index
+                    next_index += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    if index >= stop_index:
+                        continue
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to fetch result page {queued[index]}: {e}")
+                        page = {"records": [], "next_urls": []}
+
+                    fingerprint = tuple(r.get("url") or "" for r in page["records"])
+                    new_records = []
+                    if fingerprint not in seen_pages:
+                        seen_pages.add(fingerprint)
+                        for record in page["records"]:
+                            key = record.get("url") or record.get("title")
+                            if key and key not in seen_record_urls:
+                                seen_record_urls.add(key)
+                                new_records.append(record)
+                    logger.info(f"Result page {index + 1}: {len(new_records)} new records")
+
+                    if not new_records:
+                        stop_index = min(stop_index, index)
+                        continue
+                    page_records[index] = [news for news in map(self._record_to_news, new_records) if news]
+                    collected += len(page_records[index])
+
+                    for next_url in page["next_urls"]:
+                        if next_url not in queued_set:
+                            queued_set.add(next_url)
+                            queued.append(next_url)
+
+                # release the completed prefix of pages
+                while next_yield < stop_index and next_yield in page_records and yielded < self.limit:
+                    for news in page_records.pop(next_yield)[: self.limit - yielded]:
+                        yielded += 1
+                        yield news
+                    next_yield += 1
+                if yielded >= self.limit or next_yield >= stop_index:
+                    break
+
+                for future, index in list(pending.items()):
+                    if not needed(index):
+                        future.cancel()
+                        del pending[future]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def search(self, query: str):
-        from urllib.parse import quote
-
-        search_url = self._sitemap["startUrl"][0].replace("{query}", quote(query))
-        logger.info(f"Searching URL: {search_url}")
-
-        html = self._get_page_source(search_url)
-        # if response.status_code != 200:
-        #     logger.error(f"Failed to fetch search results: {response.status_code}")
-        #     return
-
-        # html = response.text
-        # print(html)
-        records: list[dict] = self.root_parser.parse(html)
-
-        for record in records[:self.limit]:
-            url = record.get("url", "")
-            if url.startswith("./"):
-                url = "https://news.google.com" + url[1:]
-            record["url"] = url
-            published_at = record.get("published_at", "")
-            if published_at:
-                published_at = dateparser.parse(published_at)  # parse human readable strings like "2 hours ago"
-            if not published_at:
-                raise ValueError("No published_at found")
+        page_urls = [
+            url
+            for start_url in self._sitemap["startUrl"]
+            for url in expand_start_url(start_url.replace("{query}", quote(query)))
+        ]
+        logger.info(f"Searching URL: {page_urls[0]} ({len(page_urls)} page URLs)")
+
+        news_stream = self._crawl(query, page_urls)
+        if not self.go_detail:
+            yield from news_stream
+            return
+
+        # fetch missing article content concurrently while later result pages are still crawled;
+        # records that already have content are ready right away
+        executor = ThreadPoolExecutor(max_workers=self.detail_workers)
+        try:
+            if self.ordered:
+                futures = deque()
+                for news in news_stream:
+                    futures.append(self._submit_detail(executor, news))
+                    while futures and futures[0].done():
+                        yield futures.popleft().result()
+                for future in futures:
+                    yield future.result()
             else:
-                published_at = published_at.date()
-            news = News(
-                title=record.get("title", "No Title"),
-                content=record.get("content", "No Content"),
-                url=url,
-                published_at=published_at,
-                source=record.get("source", "Unkown"),
-            )
-
-            # try get the content from the url if content is empty
-            if self.go_detail and (not news.content or news.content == "No Content"):
-                try:
-                    news.content = self._fetch_article_content(news.url)
-                except Exception as e:
-                    logger.error(
-                        f"Failed to fetch article content from {news.url}: {e}"
-                    )
-
-            yield news
+                pending = set()
+                for news in news_stream:
+                    pending.add(self._submit_detail(executor, news))
+                    for ready in [f for f in pending if f.done()]:
+                        pending.discard(ready)
+                        yield ready.result()
+                for future in as_completed(pending):
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_detail(self, executor: ThreadPoolExecutor, news: News) -> Future:
+        """Schedule the detail fetch for a record without content; other records complete at once."""
+        if not news.content or news.content == "No Content":
+            return executor.submit(self._fill_content, news)
+        future = Future()
+        future.set_result(news)
+        return future
+
+    def _record_to_news(self, record: dict) -> News | None:
+        url = record.get("url") or ""
+        if url.startswith("./"):
+            url = "https://news.google.com" + url[1:]
+        published_at = record.get("published_at", "")
+        if published_at:
+            published_at = dateparser.parse(published_at)  # parse human readable strings like "2 hours ago"
+        if not published_at:
+            logger.warning(f"No published_at found, skipping record: {url}")
+            return None
+        return News(
+            title=record.get("title", "No Title"),
+            content=record.get("content", "No Content"),
+            url=url,
+            published_at=published_at.date(),
+            source=record.get("source", "Unkown"),
+        )
+
+    def _fill_content(self, news: News) -> News:
+        """Try to get the content from the url, keeping the listing record on failure."""
+        try:
+            news.content = self._fetch_article_content(news.url)
+        except Exception as e:
+            logger.error(f"Failed to fetch article content from {news.url}: {e}")
+        return news
 
     def _fetch_article_content(self, url: str) -> str:
         from bs4 import BeautifulSoup
 
-        import time
-        time.sleep(2)  # 避免过快请求
-
-        import requests
-        response = requests.get(url, allow_redirects=True, timeout=10)
+        response = get_http_client().get(url, allow_redirects=True, timeout=10)
         if response.status_code != 200:
             logger.warning(f"Failed to fetch article content: {response.status_code}")
             return "No Content"
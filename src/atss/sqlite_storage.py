@@ -0,0 +1,686 @@
+"""
+SQLite 文章存储
+功能：基于 SQLite（WAL 模式）和 FTS5 全文索引的 ArticleStorage 替代实现，接口与返回格式相同，
+适合单机部署、CI 和基准测试，不需要 PostgreSQL 服务
+
+通过环境变量 DB_BACKEND=sqlite 选择（见 db_utils.get_article_storage），数据库文件由 DB_SQLITE_PATH 指定。
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from atss.db_utils import (
+    ArticleRecord,
+    ArticleSummary,
+    _TTLCache,
+    _article_content_hash,
+    _cleaned_fields,
+    _decode_cursor,
+    _dedupe_copy_rows,
+    _get_count_config,
+    _get_itersize,
+    _FACET_BUCKETS,
+    _like_pattern,
+    _normalize_sort,
+    _page_result,
+    _with_cleaned_fields,
+    logger,
+)
+from atss.data_cleaner import CLEANER_VERSION
+from atss.path_config import DATA_DIR
+
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT,
+    published_date TEXT,
+    scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    content_hash TEXT,
+    cleaned_title TEXT,
+    cleaned_content TEXT,
+    is_valid INTEGER,
+    cleaner_version INTEGER,
+    snippet TEXT GENERATED ALWAYS AS (substr(content, 1, 250)) STORED,
+    content_length INTEGER GENERATED ALWAYS AS (length(content)) STORED
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_published_date_id ON articles(published_date, id);
+CREATE INDEX IF NOT EXISTS idx_articles_source_id ON articles(source, id);
+CREATE INDEX IF NOT EXISTS idx_articles_scraped_at_id ON articles(scraped_at, id);
+CREATE INDEX IF NOT EXISTS idx_articles_created_at_id ON articles(created_at, id);
+
+-- 外部内容 FTS5 索引，由触发器与 articles 保持同步
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, content, content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, content ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+# 旧版本数据库升级到各版本的语句（新建的数据库直接使用 _SCHEMA）
+_SCHEMA_UPGRADES = {
+    2: """
+        ALTER TABLE articles ADD COLUMN cleaned_title TEXT;
+        ALTER TABLE articles ADD COLUMN cleaned_content TEXT;
+        ALTER TABLE articles ADD COLUMN is_valid INTEGER;
+        ALTER TABLE articles ADD COLUMN cleaner_version INTEGER;
+    """,
+}
+
+# 与 db_utils._PROJECTIONS 相同的列，查询中 articles 的别名为 a
+_PROJECTIONS = {
+    'full': (ArticleRecord, "a.id, a.title, a.content, a.url, a.source, a.published_date, a.scraped_at"),
+    'list': (ArticleSummary, "a.id, a.title, a.url, a.source, a.published_date, a.scraped_at, "
+                             "a.snippet, a.content_length"),
+}
+
+_UPSERT_SQL = """
+    INSERT INTO articles (title, content, url, source, published_date, scraped_at, content_hash,
+                          cleaned_title, cleaned_content, is_valid, cleaner_version)
+    VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?)
+    ON CONFLICT (url) DO UPDATE SET
+        title = excluded.title,
+        content = excluded.content,
+        source = excluded.source,
+        published_date = excluded.published_date,
+        scraped_at = excluded.scraped_at,
+        content_hash = excluded.content_hash,
+        cleaned_title = excluded.cleaned_title,
+        cleaned_content = excluded.cleaned_content,
+        is_valid = excluded.is_valid,
+        cleaner_version = excluded.cleaner_version
+"""
+
+# 各日期分桶的起始日期（星期从周一开始，与 PostgreSQL 的 date_trunc 一致）
+_BUCKET_EXPRESSIONS = {
+    'day': "a.published_date",
+    'week': "date(a.published_date, '-6 days', 'weekday 1')",
+    'month': "substr(a.published_date, 1, 7) || '-01'",
+    'year': "substr(a.published_date, 1, 4) || '-01-01'",
+}
+
+# SQLite 默认最多 999 个绑定参数
+_LOOKUP_BATCH = 500
+
+
+def _get_sqlite_path() -> str:
+    """SQLite 数据库文件路径"""
+    return os.getenv("DB_SQLITE_PATH", str(DATA_DIR / "news.db"))
+
+
+def _projection(projection: str) -> Tuple[type, str]:
+    """返回投影对应的记录类型和 SELECT 列"""
+    try:
+        return _PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"未知的列投影: {projection}") from None
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """把搜索词转换为 FTS5 查询：各词都需出现（与 plainto_tsquery 一致），无词时返回 None"""
+    words = re.findall(r"\w+", query or "")
+    return " ".join(f'"{word}"' for word in words) or None
+
+
+def _query_condition(query_text: str = None) -> Tuple[List[str], List]:
+    """title/content/source 子串匹配条件（ASCII 字母不区分大小写）"""
+    if not query_text:
+        return [], []
+    pattern = _like_pattern(query_text)
+    return (
+        ["(a.title LIKE ? ESCAPE '\\' OR a.content LIKE ? ESCAPE '\\' OR a.source LIKE ? ESCAPE '\\')"],
+        [pattern, pattern, pattern],
+    )
+
+
+def _where(conditions: List[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+class SQLiteArticleStorage:
+    """SQLite 数据库读写类，接口与 ArticleStorage 相同
+
+    每个线程使用自己的连接；WAL 模式下读取不会被写入阻塞，写入在进程内串行执行。
+    """
+
+    _count_config = _get_count_config()
+    _count_cache = _TTLCache(_count_config["cache_ttl"])
+    _facet_cache = _TTLCache(_count_config["cache_ttl"])
+
+    def __init__(self, reset=False, path: str = None):
+        self.path = path or _get_sqlite_path()
+        if reset:
+            for suffix in ("", "-wal", "-shm"):
+                Path(self.path + suffix).unlink(missing_ok=True)
+            self._count_cache.clear()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """写事务：进程内串行，BEGIN IMMEDIATE 避免与其他进程的写入死锁"""
+        conn = self._connect()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _ensure_schema(self):
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        with self._write_lock:
+            if version == 0:
+                conn.executescript(_SCHEMA)
+            else:
+                for upgrade in range(version + 1, _SCHEMA_VERSION + 1):
+                    conn.executescript(_SCHEMA_UPGRADES[upgrade])
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _fetch_dicts(self, sql: str, params=()) -> List[Dict]:
+        """执行查询并以字典列表返回所有行"""
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def _fetch_scalar(self, sql: str, params=()):
+        """执行查询并返回第一行第一列"""
+        row = self._connect().execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    def _iter_rows(self, sql: str, params=(), itersize: int = None, compact: bool = False,
+                   record_type: type = ArticleRecord):
+        """按 itersize 分批取回并逐行产出，compact 为 True 时产出 record_type 记录"""
+        cursor = self._connect().execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(itersize or _get_itersize())
+                if not rows:
+                    break
+                for row in rows:
+                    record = record_type._make(row)
+                    yield record if compact else record._asdict()
+        finally:
+            cursor.close()
+
+    def _insert_article(self, article: Dict) -> bool:
+        """插入单篇文章到数据库"""
+        stats = self.bulk_upsert_articles([article])
+        return stats['failed'] == 0
+
+    def save_articles(self, articles: List[Dict], chunk_size: int = 1000) -> int:
+        """批量插入文章到数据库
+
+        Returns:
+            成功写入（新增、更新或未变化）的文章数
+        """
+        stats = self.bulk_upsert_articles(articles, chunk_size=chunk_size)
+        return stats['inserted'] + stats['updated'] + stats['unchanged']
+
+    def bulk_upsert_articles(self, articles: List[Dict], chunk_size: int = 1000) -> Dict[str, int]:
+        """批量写入文章，按块提交；content_hash 未变化的已有文章不会被改写
+
+        Returns:
+            {'inserted': 新增数, 'updated': 更新数, 'unchanged': 未变化数, 'failed': 失败数}
+        """
+        rows, failed = _dedupe_copy_rows(articles)
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': failed}
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                with self._transaction() as conn:
+                    existing = {}
+                    for i in range(0, len(chunk), _LOOKUP_BATCH):
+                        urls = [row[2] for row in chunk[i:i + _LOOKUP_BATCH]]
+                        existing.update(conn.execute(
+                            f"SELECT url, content_hash FROM articles WHERE url IN ({','.join('?' * len(urls))})",
+                            urls,
+                        ).fetchall())
+                    changed = _with_cleaned_fields(
+                        [row for row in chunk if row[2] not in existing or existing[row[2]] != row[6]], existing)
+                    # SQLite 的时间格式为 "YYYY-MM-DD HH:MM:SS"
+                    conn.executemany(_UPSERT_SQL, [
+                        row[:5] + (row[5].replace('T', ' ') if row[5] else None,) + row[6:] for row in changed
+                    ])
+                inserted = sum(1 for row in changed if row[2] not in existing)
+                stats['inserted'] += inserted
+                stats['updated'] += len(changed) - inserted
+                stats['unchanged'] += len(chunk) - len(changed)
+            except Exception as e:
+                logger.error(f"批量写入文章失败（{len(chunk)} 篇）: {e}")
+                stats['failed'] += len(chunk)
+
+        logger.info(
+            f"批量写入 {len(articles)} 篇文章: 新增 {stats['inserted']}, 更新 {stats['updated']}, "
+            f"未变化 {stats['unchanged']}, 失败 {stats['failed']}"
+        )
+        return stats
+
+    def get_precleaned(self, articles: List[Dict]) -> Dict[str, Dict]:
+        """查询入库时保存的当前版本清洗结果，参数与返回值同 ArticleStorage.get_precleaned"""
+        hashes = {a['url']: _article_content_hash(a) for a in articles if a.get('url') and a.get('title')}
+        urls = list(hashes)
+        precleaned = {}
+        for i in range(0, len(urls), _LOOKUP_BATCH):
+            batch = urls[i:i + _LOOKUP_BATCH]
+            rows = self._fetch_dicts(f"""
+                SELECT url, content_hash, cleaned_title, cleaned_content, is_valid
+                FROM articles
+                WHERE url IN ({','.join('?' * len(batch))}) AND cleaner_version = ?
+            """, batch + [CLEANER_VERSION])
+            for row in rows:
+                if row.pop('content_hash') == hashes[row['url']]:
+                    row['is_valid'] = bool(row['is_valid'])
+                    precleaned[row.pop('url')] = row
+        return precleaned
+
+    def backfill_cleaned(self, batch_size: int = 500) -> int:
+        """为清洗版本不是当前 CLEANER_VERSION 的文章重新生成清洗结果，返回更新的文章数"""
+        updated = 0
+        last_id = 0
+        while True:
+            rows = self._fetch_dicts("""
+                SELECT id, title, content, url, source, published_date
+                FROM articles
+                WHERE id > ? AND cleaner_version IS NOT ?
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, CLEANER_VERSION, batch_size))
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            with self._transaction() as conn:
+                conn.executemany("""
+                    UPDATE articles SET cleaned_title = ?, cleaned_content = ?, is_valid = ?, cleaner_version = ?
+                    WHERE id = ?
+                """, [_cleaned_fields(row) + (row['id'],) for row in rows])
+            updated += len(rows)
+            logger.info(f"已回填 {updated} 篇文章的清洗结果")
+        return updated
+
+    def close(self):
+        """关闭本实例打开的所有连接"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def get_stats(self, top: int = 20) -> Dict:
+        """获取存储层的运行统计，参数同 ArticleStorage.get_stats
+
+        SQLite 后端不记录语句耗时，'queries' 总是空列表。
+        """
+        return {
+            'sqlite': {
+                'path': self.path,
+                'connections': len(self._connections),
+                'journal_mode': self._fetch_scalar("PRAGMA journal_mode"),
+            },
+            'queries': [],
+        }
+
+    def search_article(self, query, limit: int = 50, date_from=None, date_to=None,
+                       projection: str = 'full') -> List[Dict]:
+        """FTS5 全文搜索，按 bm25 相关度排序（标题命中权重高于正文）
+
+        rank 越大越相关，参数与返回值同 ArticleStorage.search_article。
+        """
+        _, columns = _projection(projection)
+        match = _match_expression(query)
+        if match is None:
+            return []
+        conditions = ["articles_fts MATCH ?"]
+        params = [match]
+        if date_from is not None:
+            conditions.append("a.published_date >= ?")
+            params.append(str(date_from))
+        if date_to is not None:
+            conditions.append("a.published_date <= ?")
+            params.append(str(date_to))
+        params.append(limit)
+
+        try:
+            results = self._fetch_dicts(f"""
+                SELECT {columns},
+                        -bm25(articles_fts, 10.0, 1.0) as rank
+                FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+                {_where(conditions)}
+                ORDER BY rank DESC, a.published_date DESC NULLS LAST, a.id DESC
+                LIMIT ?
+            """, params)
+            logger.info(f"搜索到 {len(results)} 篇相关文章")
+            return results
+        except Exception as e:
+            logger.error(f"搜索文章失败: {e}")
+            return []
+
+    def iter_all_articles(self, limit: int = None, itersize: int = None, compact: bool = False,
+                          projection: str = 'full') -> Iterator:
+        """流式遍历所有文章"""
+        record_type, columns = _projection(projection)
+        query = f"SELECT {columns} FROM articles a"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self._iter_rows(query, itersize=itersize, compact=compact, record_type=record_type)
+
+    def iter_articles_by_date_range(self, days: int = 7, itersize: int = None, compact: bool = False,
+                                    projection: str = 'full') -> Iterator:
+        """流式遍历指定天数内的文章，按发布日期倒序"""
+        record_type, columns = _projection(projection)
+        return self._iter_rows(f"""
+            SELECT {columns}
+            FROM articles a
+            WHERE a.published_date >= date('now', ?)
+            ORDER BY a.published_date DESC
+        """, (f"-{int(days)} days",), itersize=itersize, compact=compact, record_type=record_type)
+
+    def iter_articles_by_source(self, source: str, itersize: int = None, compact: bool = False,
+                                projection: str = 'full') -> Iterator:
+        """流式遍历指定来源的文章，按发布日期倒序"""
+        record_type, columns = _projection(projection)
+        return self._iter_rows(f"""
+            SELECT {columns}
+            FROM articles a
+            WHERE a.source = ?
+            ORDER BY a.published_date DESC
+        """, (source,), itersize=itersize, compact=compact, record_type=record_type)
+
+    def get_all_articles(self, limit: int = None, projection: str = 'full') -> List[Dict]:
+        """获取所有文章"""
+        _projection(projection)
+        try:
+            articles = list(self.iter_all_articles(limit=limit, projection=projection))
+            logger.info(f"从数据库获取了 {len(articles)} 篇文章")
+            return articles
+        except Exception as e:
+            logger.error(f"获取文章失败: {e}")
+            return []
+
+    def get_articles_by_date_range(self, days: int = 7, projection: str = 'full') -> List[Dict]:
+        """获取指定天数内的文章"""
+        _projection(projection)
+        try:
+            articles = list(self.iter_articles_by_date_range(days, projection=projection))
+            logger.info(f"从数据库获取了最近{days}天的 {len(articles)} 篇文章")
+            return articles
+        except Exception as e:
+            logger.error(f"获取文章失败: {e}")
+            return []
+
+    def get_articles_by_source(self, source: str, projection: str = 'full') -> List[Dict]:
+        """根据来源获取文章"""
+        _projection(projection)
+        try:
+            articles = list(self.iter_articles_by_source(source, projection=projection))
+            logger.info(f"从数据库获取了来源为 {source} 的 {len(articles)} 篇文章")
+            return articles
+        except Exception as e:
+            logger.error(f"获取文章失败: {e}")
+            return []
+
+    def get_articles_by_query(self, query_text: str, limit: int = 100, projection: str = 'full') -> List[Dict]:
+        """根据文本查询文章（title/content/source 子串匹配）"""
+        _, columns = _projection(projection)
+        try:
+            conditions, params = _query_condition(query_text)
+            articles = self._fetch_dicts(f"""
+                SELECT {columns}
+                FROM articles a
+                {_where(conditions)}
+                ORDER BY a.published_date DESC
+                LIMIT ?
+            """, params + [limit])
+            logger.info(f"通过查询 '{query_text}' 找到 {len(articles)} 篇文章")
+            return articles
+        except Exception as e:
+            logger.error(f"查询文章失败: {e}")
+            return []
+
+    def _sorted(self, query_text, limit, offset, sort_by, sort_dir, projection) -> List[Dict]:
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
+        conditions, params = _query_condition(query_text)
+        sql = f"""
+            SELECT {columns}
+            FROM articles a
+            {_where(conditions)}
+            ORDER BY a.{sort_by} {sort_dir} NULLS LAST, a.id {sort_dir}
+        """
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return self._fetch_dicts(sql, params)
+
+    def get_articles_by_query_with_sort(self, query_text: str, limit: int = 100, offset: int = 0,
+                                        sort_by: str = 'published_date', sort_dir: str = 'desc',
+                                        projection: str = 'full') -> List[Dict]:
+        """带排序和偏移的子串查询"""
+        try:
+            articles = self._sorted(query_text, limit, offset, sort_by, sort_dir, projection)
+            logger.info(f"通过查询 '{query_text}' 找到 {len(articles)} 篇文章 (排序: {sort_by} {sort_dir})")
+            return articles
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"查询文章失败: {e}")
+            return []
+
+    def get_all_articles_with_sort(self, limit: int = None, sort_by: str = 'published_date',
+                                   sort_dir: str = 'desc', projection: str = 'full') -> List[Dict]:
+        """按排序返回所有文章"""
+        return self.get_all_articles_with_sort_and_offset(limit, 0, sort_by, sort_dir, projection)
+
+    def get_all_articles_with_sort_and_offset(self, limit: int = None, offset: int = 0,
+                                              sort_by: str = 'published_date', sort_dir: str = 'desc',
+                                              projection: str = 'full') -> List[Dict]:
+        """按排序、偏移返回文章"""
+        try:
+            articles = self._sorted(None, limit, offset, sort_by, sort_dir, projection)
+            logger.info(f"从数据库获取了 {len(articles)} 篇文章 (排序: {sort_by} {sort_dir}, offset={offset})")
+            return articles
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"获取文章失败: {e}")
+            return []
+
+    def get_articles_page(self, query_text: str = None, limit: int = 25, sort_by: str = 'published_date',
+                          sort_dir: str = 'desc', cursor: str = None,
+                          projection: str = 'full') -> Tuple[List[Dict], Optional[str]]:
+        """键集分页，参数与返回值同 ArticleStorage.get_articles_page（游标格式相同）
+
+        Raises:
+            ValueError: 游标无效或与排序方式不一致，或投影未知
+        """
+        sort_by, sort_dir = _normalize_sort(sort_by, sort_dir)
+        _, columns = _projection(projection)
+        after = _decode_cursor(cursor, sort_by, sort_dir) if cursor else None
+        cmp = '<' if sort_dir == 'DESC' else '>'
+        base_conditions, base_params = _query_condition(query_text)
+
+        def query(conditions, params, order_by):
+            return f"""
+                SELECT {columns},
+                        CAST(a.{sort_by} AS TEXT) as _sort_key
+                FROM articles a
+                {_where(conditions)}
+                ORDER BY {order_by}
+                LIMIT ?
+            """, params
+
+        # 与 PostgreSQL 版本相同：先取排序列非空的行，再按 id 取排序列为空的行
+        if sort_by == 'id':
+            conditions, params = list(base_conditions), list(base_params)
+            if after:
+                conditions.append(f"a.id {cmp} ?")
+                params.append(after['i'])
+            queries = [query(conditions, params, f"a.id {sort_dir}")]
+        else:
+            queries = []
+            in_null_group = after is not None and after['v'] is None
+            if not in_null_group:
+                conditions = base_conditions + [f"a.{sort_by} IS NOT NULL"]
+                params = list(base_params)
+                if after:
+                    conditions.append(f"(a.{sort_by}, a.id) {cmp} (?, ?)")
+                    params += [after['v'], after['i']]
+                queries.append(query(conditions, params, f"a.{sort_by} {sort_dir}, a.id {sort_dir}"))
+            conditions = base_conditions + [f"a.{sort_by} IS NULL"]
+            params = list(base_params)
+            if in_null_group:
+                conditions.append(f"a.id {cmp} ?")
+                params.append(after['i'])
+            queries.append(query(conditions, params, f"a.id {sort_dir}"))
+
+        want = limit + 1
+        rows = []
+        try:
+            for sql, params in queries:
+                if len(rows) >= want:
+                    break
+                rows += self._fetch_dicts(sql, params + [want - len(rows)])
+        except Exception as e:
+            logger.error(f"分页获取文章失败: {e}")
+            return [], None
+
+        rows, next_cursor = _page_result(rows, limit, sort_by, sort_dir)
+        logger.info(f"分页获取了 {len(rows)} 篇文章 (排序: {sort_by} {sort_dir}, 游标: {'有' if cursor else '无'})")
+        return rows, next_cursor
+
+    def count_articles(self, query_text: str = None, cap: int = None) -> Dict:
+        """统计全部文章或匹配 query_text 的文章数量
+
+        全部文章总是精确计数；带查询时只精确计数到 cap 条，超过时返回 cap + 1（SQLite 没有行数估算）。
+
+        Returns:
+            {'count': 数量, 'exact': 是否为精确值}
+        """
+        cap = self._count_config["cap"] if cap is None else cap
+        key = (self.path, query_text or '', cap)
+        cached = self._count_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        conditions, params = _query_condition(query_text)
+        try:
+            if not conditions:
+                result = {'count': self._fetch_scalar("SELECT COUNT(*) FROM articles"), 'exact': True}
+            else:
+                count = self._fetch_scalar(
+                    f"SELECT COUNT(*) FROM (SELECT 1 FROM articles a {_where(conditions)} LIMIT ?)",
+                    params + [cap + 1],
+                )
+                result = {'count': count, 'exact': count <= cap}
+        except Exception as e:
+            logger.error(f"统计文章数量失败: {e}")
+            return {'count': 0, 'exact': False}
+
+        self._count_cache.set(key, result)
+        return dict(result)
+
+    def get_article_count_by_query(self, query_text: str) -> int:
+        """统计匹配 query_text 的文章数量（同 count_articles(query_text)['count']）
+
+        以前总是精确计数；现在超过 DB_COUNT_CAP 时返回 DB_COUNT_CAP + 1，需要精确值时调用
+        count_articles(query_text, cap=...) 并检查 'exact'。
+        """
+        return self.count_articles(query_text)['count']
+
+    def get_article_count(self) -> int:
+        """获取文章总数（同 count_articles()['count']）"""
+        return self.count_articles()['count']
+
+    def get_facets(self, query_text: str = None, bucket: str = 'month', source_limit: int = 50) -> Dict:
+        """分面统计：各来源的文章数，以及按日期分桶的文章数，返回格式同 ArticleStorage.get_facets
+
+        SQLite 后端没有汇总表，直接在 (来源, id)、(发布日期, id) 索引上分组计数。
+
+        Raises:
+            ValueError: 日期分桶未知
+        """
+        if bucket not in _FACET_BUCKETS:
+            raise ValueError(f"未知的日期分桶: {bucket}")
+        key = (self.path, query_text or '', bucket, source_limit)
+        cached = self._facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        conditions, params = _query_condition(query_text)
+        try:
+            result = {
+                'bucket': bucket,
+                'sources': self._fetch_dicts(f"""
+                    SELECT a.source, COUNT(*) AS count
+                    FROM articles a
+                    {_where(conditions)}
+                    GROUP BY a.source
+                    ORDER BY count DESC, a.source
+                    LIMIT ?
+                """, params + [source_limit]),
+                'dates': self._fetch_dicts(f"""
+                    SELECT {_BUCKET_EXPRESSIONS[bucket]} AS date, COUNT(*) AS count
+                    FROM articles a
+                    {_where(conditions)}
+                    GROUP BY 1
+                    ORDER BY 1 NULLS LAST
+                """, params),
+            }
+        except Exception as e:
+            logger.error(f"分面统计失败: {e}")
+            return {'bucket': bucket, 'sources': [], 'dates': []}
+
+        self._facet_cache.set(key, result)
+        return result
+
+    def get_sources(self) -> List[str]:
+        """获取所有新闻源"""
+        try:
+            rows = self._connect().execute("SELECT DISTINCT source FROM articles ORDER BY source NULLS LAST").fetchall()
+            return [row[0] for row in rows]
+        except Exception as e:
+            logger.error(f"获取新闻源失败: {e}")
+            return []